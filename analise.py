@@ -0,0 +1,208 @@
+"""
+Análise de dificuldade de muitos Campos de uma só vez
+
+As funções de análise do projeto.py (planos_vizinhas, grelha_vizinhas,
+metricas_dificuldade) tratam um Campo de cada vez, com um mapa de bits por
+Campo. Aqui os mapas de bits de muitos Campos com as mesmas dimensões são
+empilhados num único inteiro, uma fatia por Campo, e cada operação de bits
+avança todos os Campos da pilha ao mesmo tempo.
+
+Uso:
+    from analise import *
+    metricas_mascaras([mascara_minas(m) for m in campos], 16, 16)
+    for s, metricas in metricas_sementes(('P', 16, 40, 32, ('H', 8)), range(1, 100001)): ...
+"""
+from projeto import *
+
+_PILHA = 256    # Número máximo de Campos por pilha, nos geradores metricas_campos e metricas_sementes
+
+##########################
+### Pilha de Campos    ###
+##########################
+
+### Na pilha, cada linha de um Campo ocupa colunas + 1 bits: a coluna a mais
+### fica sempre a 0 e separa a última coluna de uma linha da primeira coluna
+### da linha seguinte, pelo que os deslocamentos de 1 bit não precisam de
+### máscaras. Cada fatia tem ainda uma linha e um bit de folga, para que os
+### deslocamentos de uma linha não passem de uma fatia para a outra, e é
+### arredondada a um número inteiro de bytes, para que a pilha possa ser
+### montada e desmontada com to_bytes / from_bytes. O bit mais alto de cada
+### fatia (o topo) nunca pertence a uma Parcela e serve para detetar, com uma
+### única soma, as fatias em que um mapa de bits não é nulo.
+
+def cria_pilha(mascaras, colunas, linhas):
+    """
+    (Baixo Nível)
+    Pilha com as máscaras das minas de vários Campos com as mesmas dimensões
+
+    mascaras (list) -- Máscaras das minas (ver mascara_minas), uma por Campo
+    colunas (int)   -- Número de colunas
+    linhas (int)    -- Número de linhas
+    return (dict)   -- Pilha
+    """
+    if not isinstance(mascaras, (list, tuple)) or not all(isinstance(x, int) for x in (colunas, linhas)) \
+            or colunas < 1 or linhas < 1 \
+            or not all(isinstance(x, int) and 0 <= x < 1 << colunas * linhas for x in mascaras):
+        raise ValueError('cria_pilha: argumentos invalidos')
+    largura = colunas + 1
+    octetos = (linhas * largura + largura + 8) // 8     # Linhas, linha de folga e topo, arredondados ao byte
+    n = len(mascaras)
+    repete = lambda v: int.from_bytes(v.to_bytes(octetos, 'little') * n, 'little')    # O mesmo valor em todas as fatias
+    juntas = int.from_bytes(b''.join(x.to_bytes(octetos, 'little') for x in mascaras), 'little')
+    linha = (1 << colunas) - 1
+    minas = 0
+    for l in range(linhas):     # A linha l sobe l bits, para abrir espaço para as colunas de separação
+        minas |= (juntas & repete(linha << l * colunas)) << l
+    topos, bases = repete(1 << 8 * octetos - 1), repete(1)
+    return {'colunas': colunas, 'linhas': linhas, 'largura': largura, 'octetos': octetos, 'campos': n,
+            'minas': minas, 'validas': repete(sum(linha << l * largura for l in range(linhas))),
+            'topos': topos, 'bases': bases, 'abaixo': topos - bases}
+
+def _desempilha(p, x):
+    """ Mapa de bits de cada fatia de x, ainda com as colunas de separação """
+    b, k = x.to_bytes(p['octetos'] * p['campos'], 'little'), p['octetos']
+    return [int.from_bytes(b[i:i + k], 'little') for i in range(0, len(b), k)]
+
+def _dilata_pilha(p, x):
+    """ Parcelas em x e as suas vizinhas, em todas as fatias """
+    x |= x << 1 | x >> 1
+    return x | x << p['largura'] | x >> p['largura']
+
+def _menores_pilha(p, x):
+    """ Parcela de menor índice de x em cada fatia """
+    y = x | p['topos']
+    return y & ~(y - p['bases']) & ~p['topos']
+
+def planos_pilha(p):
+    """
+    (Baixo Nível)
+    Número de minas vizinhas de todas as Parcelas da pilha, em 4 mapas de
+    bits empilhados, como em planos_vizinhas
+
+    p (dict)       -- Pilha
+    return (tuple) -- 4 mapas de bits
+    """
+    minas, largura = p['minas'], p['largura']
+    esquerda, direita = minas << 1, minas >> 1
+    planos = [0, 0, 0, 0]
+    for v in (esquerda, direita, esquerda << largura, minas << largura, direita << largura,
+              esquerda >> largura, minas >> largura, direita >> largura):
+        for k in range(4):
+            planos[k], v = planos[k] ^ v, planos[k] & v
+            if not v: break
+    return tuple(x & p['validas'] for x in planos)
+
+def _componentes_pilha(p, x, seguras=None):
+    """
+    Componentes ligadas das Parcelas em x, em todas as fatias. Cada fatia
+    avança por si: quando a sua componente deixa de crescer, a seguinte
+    começa logo na iteração a seguir, sem esperar pelas outras fatias.
+    Devolve as Parcelas de onde partiu cada componente e, se seguras for
+    dado, as Parcelas seguras reveladas por cada componente, por fatia
+    """
+    topos, abaixo, largura, k = p['topos'], p['abaixo'], p['largura'], p['octetos']
+    total, ultimo = k * p['campos'], 8 * k - 1
+    tamanhos = [[] for _ in range(p['campos'])]
+    comp = inicios = _menores_pilha(p, x)
+    while comp:
+        maior = comp | comp << 1 | comp >> 1
+        maior = (maior | maior << largura | maior >> largura) & x
+        # Topo das fatias com uma componente por terminar (comp não nulo) que não cresceu (maior ^ comp nulo)
+        paradas = (comp + abaixo) & topos & ~((maior ^ comp) + abaixo)
+        if paradas:
+            fatias = paradas - (paradas >> ultimo)      # Todos os bits das fatias paradas
+            feitas = maior & fatias
+            if seguras is not None:
+                reveladas = (_dilata_pilha(p, feitas) & seguras).to_bytes(total, 'little')
+                for i, v in enumerate(paradas.to_bytes(total, 'little')[k - 1::k]):
+                    if v: tamanhos[i].append(int.from_bytes(reveladas[i * k:i * k + k], 'little').bit_count())
+            x &= ~feitas
+            novas = _menores_pilha(p, x & fatias)
+            inicios |= novas
+            maior = maior & ~fatias | novas
+        comp = maior
+    return inicios, tamanhos
+
+###################################
+### Métricas de muitos Campos   ###
+###################################
+
+def grelhas_vizinhas(mascaras, colunas, linhas):
+    """
+    (Alto Nível)
+    Número de minas vizinhas de cada Parcela de cada Campo, como em
+    grelha_vizinhas
+
+    mascaras (list) -- Máscaras das minas, uma por Campo
+    colunas (int)   -- Número de colunas
+    linhas (int)    -- Número de linhas
+    return (list)   -- Contagens de cada Campo (bytes), pela mesma ordem
+    """
+    p = cria_pilha(mascaras, colunas, linhas)
+    digitos = 8 * p['octetos'] * p['campos']
+    # Como em grelha_vizinhas: um dígito hexadecimal por bit, e os dígitos passam a bytes pela tabela
+    soma = sum(int(bin(x)[2:], 16) << k for k, x in enumerate(planos_pilha(p)))
+    grelha = '{:0{}x}'.format(soma, digitos)[::-1].encode().translate(_HEXADECIMAL)
+    largura, fatia = p['largura'], 8 * p['octetos']
+    return [b''.join(grelha[i + l * largura:i + l * largura + colunas] for l in range(linhas))
+            for i in range(0, digitos, fatia)]
+
+_HEXADECIMAL = bytes.maketrans(b'012345678', bytes(range(9)))
+
+def metricas_mascaras(mascaras, colunas, linhas):
+    """
+    (Alto Nível)
+    Métricas de dificuldade (ver metricas_dificuldade) de vários Campos com
+    as mesmas dimensões, calculadas sobre uma única pilha
+
+    mascaras (list) -- Máscaras das minas, uma por Campo
+    colunas (int)   -- Número de colunas
+    linhas (int)    -- Número de linhas
+    return (list)   -- Métricas de cada Campo, pela mesma ordem
+    """
+    p = cria_pilha(mascaras, colunas, linhas)
+    p0, p1, p2, p3 = planos_pilha(p)
+    seguras = p['validas'] & ~p['minas']
+    zeros = seguras & ~(p0 | p1 | p2 | p3)
+    _, tamanhos = _componentes_pilha(p, zeros, seguras)
+    isoladas = seguras & ~_dilata_pilha(p, zeros)
+    ilhas, _ = _componentes_pilha(p, isoladas)
+    return [{'aberturas': len(t), 'tamanhos': tuple(t), '3bv': len(t) + i.bit_count(), 'ilhas': h.bit_count()}
+            for t, i, h in zip(tamanhos, _desempilha(p, isoladas), _desempilha(p, ilhas))]
+
+def metricas_campos(campos):
+    """
+    (Alto Nível)
+    Métricas de dificuldade de cada um dos Campos. Os Campos seguidos com as
+    mesmas dimensões são tratados em pilhas de até _PILHA Campos
+
+    campos (iter)      -- Campos de Minas
+    return (generator) -- Métricas de cada Campo, pela mesma ordem
+    """
+    pilha, dimensoes = [], None
+    for m in campos:
+        d = (ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m))
+        if pilha and (d != dimensoes or len(pilha) == _PILHA):
+            yield from metricas_mascaras(pilha, *dimensoes)
+            pilha = []
+        pilha.append(mascara_minas(m))
+        dimensoes = d
+    if pilha: yield from metricas_mascaras(pilha, *dimensoes)
+
+def metricas_sementes(config, sementes):
+    """
+    (Alto Nível)
+    Métricas de dificuldade do Campo de cada seed, sem criar os Campos, em
+    pilhas de até _PILHA seeds. Pode ser usada com varre_sementes, por blocos
+    de seeds
+
+    config (tuple)     -- (c, l, n, d, primeira Coordenada), como em analisa_semente
+    sementes (iter)    -- Seeds
+    return (generator) -- Pares (seed, métricas)
+    """
+    colunas, linhas = ord(config[0]) - 64, config[1]
+    sementes = iter(sementes)
+    while True:
+        bloco = [s for _, s in zip(range(_PILHA), sementes)]
+        if not bloco: return
+        yield from zip(bloco, metricas_mascaras([mascara_minas_semente(config, s) for s in bloco], colunas, linhas))
@@ -0,0 +1,219 @@
+"""
+Medições de desempenho do projeto.py
+
+Todas as medições usam seeds fixas, pelo que medem sempre o mesmo
+trabalho. Os resultados podem ser guardados em JSON e comparados com
+resultados guardados anteriormente.
+
+Uso:
+    python benchmark.py                           -- Corre todas as medições
+    python benchmark.py -k limpa_campo            -- Apenas as que contêm 'limpa_campo'
+    python benchmark.py --json atual.json         -- Guarda os resultados
+    python benchmark.py --base base.json          -- Compara com resultados anteriores
+    python benchmark.py --confianca               -- Custo por turno com e sem modo de confiança
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+
+from projeto import *
+import analise
+
+SEED = 73
+
+def prepara_campo(cria, seed, n=400):
+    """
+    Cria um Campo Z99 com minas colocadas a partir de uma seed fixa e
+    devolve-o, juntamente com as Coordenadas seguras ainda tapadas, pela
+    ordem em que vão ser jogadas
+
+    cria (function) -- Construtor do Campo (cria_campo ou cria_campo_compacto)
+    seed (int)      -- Seed do Gerador
+    n (int)         -- Número de minas
+    """
+    m = cria('Z', 99)
+    coloca_minas(m, cria_coordenada('M', 50), cria_gerador(32, seed), n)
+    jogadas = [c for c in obtem_coordenadas(m, 'tapadas') if not eh_parcela_minada(obtem_parcela(m, c))]
+    return m, jogadas
+
+def campo_a_meio(cria, seed=SEED):
+    """ Campo Z99 a meio de um jogo: algumas Parcelas limpas e algumas bandeiras """
+    m, jogadas = prepara_campo(cria, seed)
+    for c in jogadas[::40]: limpa_campo(m, c)
+    for c in obtem_coordenadas(m, 'minadas')[::3]: alterna_bandeira(obtem_parcela(m, c))
+    return m
+
+def campo_vazio(cria):
+    """ Campo Z99 com uma única mina, no canto, para uma limpeza que percorre todo o Campo """
+    m = cria('Z', 99)
+    esconde_mina(obtem_parcela(m, cria_coordenada('Z', 99)))
+    return m
+
+###################
+### Medições    ###
+###################
+
+### Cada medição é uma função que recebe o número da repetição e devolve
+### a função a cronometrar; a preparação não conta para o tempo medido.
+
+def b_atualiza_estado(bits):
+    def prepara(i):
+        g = cria_gerador(bits, SEED + i)
+        def mede():
+            for k in range(100000): atualiza_estado(g)
+        return mede
+    return prepara
+
+def b_coloca_minas(n, modo='gerador'):
+    def prepara(i):
+        m, g = cria_campo_compacto('Z', 99), cria_gerador(32, SEED + i)
+        return lambda: coloca_minas(m, cria_coordenada('M', 50), g, n, modo)
+    return prepara
+
+def b_limpa_campo(cria):
+    def prepara(i):
+        m = campo_vazio(cria)
+        return lambda: limpa_campo(m, cria_coordenada('A', 1))
+    return prepara
+
+def b_sobre_campo(cria, funcao, *args):
+    def prepara(i):
+        m = campo_a_meio(cria)
+        return lambda: funcao(m, *args)
+    return prepara
+
+def b_jogo_completo(i):
+    return lambda: simula_jogo('P', 16, 40, 32, SEED + i, jogador_resolvedor())
+
+def b_metricas(pilha):
+    def prepara(i):
+        config = ('P', 16, 40, 32, cria_coordenada('H', 8))
+        mascaras = [mascara_minas_semente(config, s) for s in range(SEED + 2048 * i, SEED + 2048 * (i + 1))]
+        if pilha: return lambda: [analise.metricas_mascaras(mascaras[k:k + analise._PILHA], 16, 16) for k in range(0, 2048, analise._PILHA)]
+        return lambda: [metricas_dificuldade(x, 16, 16) for x in mascaras]
+    return prepara
+
+MEDICOES = {
+    'atualiza_estado_32x100k':          (b_atualiza_estado(32), 5),
+    'atualiza_estado_64x100k':          (b_atualiza_estado(64), 5),
+    'gera_numeros_aleatorios_32x100k':  (lambda i: lambda: gera_numeros_aleatorios(cria_gerador(32, SEED + i), 99, 100000), 5),
+    'coloca_minas_z99_baixa':           (b_coloca_minas(250), 5),
+    'coloca_minas_z99_media':           (b_coloca_minas(500), 5),
+    'coloca_minas_z99_quase_maxima':    (b_coloca_minas(26 * 99 - 9), 3),
+    'coloca_minas_z99_quase_maxima_fy': (b_coloca_minas(26 * 99 - 9, 'fisher-yates'), 3),
+    'limpa_campo_z99':                  (b_limpa_campo(cria_campo_compacto), 5),
+    'limpa_campo_z99_dicionario':       (b_limpa_campo(cria_campo), 3),
+    'obtem_coordenadas_z99':            (b_sobre_campo(cria_campo_compacto, obtem_coordenadas, 'limpas'), 5),
+    'campo_para_str_z99':               (b_sobre_campo(cria_campo_compacto, campo_para_str), 5),
+    'campo_para_str_z99_dicionario':    (b_sobre_campo(cria_campo, campo_para_str), 1),
+    'cria_copia_campo_z99':             (b_sobre_campo(cria_campo_compacto, cria_copia_campo), 5),
+    'cria_copia_campo_z99_dicionario':  (b_sobre_campo(cria_campo, cria_copia_campo), 1),
+    'jogo_ganho_z99':                   (b_sobre_campo(cria_campo_compacto, jogo_ganho), 5),
+    'jogo_ganho_z99_dicionario':        (b_sobre_campo(cria_campo, jogo_ganho), 1),
+    'simula_jogo_p16_resolvedor':       (b_jogo_completo, 5),
+    'metricas_dificuldade_p16x2048':    (b_metricas(False), 3),
+    'metricas_mascaras_p16x2048':       (b_metricas(True), 3),
+}
+
+def corre(prepara, repeticoes):
+    """
+    Corre uma medição 'repeticoes' vezes, devolvendo o tempo mínimo e a
+    mediana, em segundos
+
+    prepara (function) -- Recebe o número da repetição e devolve a função a medir
+    repeticoes (int)   -- Número de repetições
+    return (dict)      -- Resultado da medição
+    """
+    tempos = []
+    for i in range(repeticoes):
+        mede = prepara(i)
+        inicio = time.perf_counter()
+        mede()
+        tempos.append(time.perf_counter() - inicio)
+    return {'minimo': min(tempos), 'mediana': statistics.median(tempos), 'repeticoes': repeticoes}
+
+def compara(resultados, base, tolerancia):
+    """
+    Compara os resultados com os de uma execução anterior, pela mediana.
+    Devolve os nomes das medições que ficaram mais lentas do que a
+    tolerância permite
+
+    resultados (dict)  -- Resultados atuais
+    base (dict)        -- Resultados anteriores
+    tolerancia (float) -- Razão máxima aceite entre o tempo atual e o anterior
+    return (list)      -- Medições com regressão
+    """
+    regressoes = []
+    for nome, r in resultados.items():
+        if nome not in base: continue
+        razao = r['mediana'] / base[nome]['mediana']
+        marca = ''
+        if razao > tolerancia:
+            regressoes.append(nome)
+            marca = '  <-- REGRESSAO'
+        print('{:<36} {:10.3f} ms  base {:10.3f} ms  {:6.2f}x{}'.format(
+            nome, r['mediana'] * 1000, base[nome]['mediana'] * 1000, razao, marca))
+    return regressoes
+
+def custo_turno(cria, confianca, turnos=5, seed=SEED):
+    """
+    Mede o tempo médio (em segundos) de um turno de jogo sobre um Campo
+    Z99: limpar uma Parcela, desenhar o Campo, contar bandeiras e
+    verificar a condição de vitória, tal como em minas()
+
+    cria (function)  -- Construtor do Campo
+    confianca (bool) -- Se o turno corre em modo de confiança
+    turnos (int)     -- Número de turnos medidos
+    seed (int)       -- Seed do Gerador
+    """
+    m, jogadas = prepara_campo(cria, seed)
+    anterior = define_modo_confianca(confianca)
+    try:
+        inicio = time.perf_counter()
+        for c in jogadas[::len(jogadas) // turnos][:turnos]:
+            limpa_campo(m, c)
+            campo_para_str(m)
+            conta_coordenadas(m, 'marcadas')
+            jogo_ganho(m)
+        return (time.perf_counter() - inicio) / turnos
+    finally: define_modo_confianca(anterior)
+
+def compara_modo_confianca():
+    """ Mostra o custo por turno num Campo Z99, com e sem modo de confiança """
+    for nome, cria in (('cria_campo', cria_campo), ('cria_campo_compacto', cria_campo_compacto)):
+        validado, confiado = custo_turno(cria, False), custo_turno(cria, True)
+        print('{:<20} validado {:8.2f} ms  confiança {:8.2f} ms  ({:.1f}x)'.format(
+            nome, validado * 1000, confiado * 1000, validado / confiado))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Medições de desempenho do projeto.py')
+    parser.add_argument('-k', dest='filtro', default='', help='corre apenas as medições cujo nome contém o texto dado')
+    parser.add_argument('--json', help='ficheiro onde guardar os resultados')
+    parser.add_argument('--base', help='resultados anteriores (JSON) com que comparar')
+    parser.add_argument('--tolerancia', type=float, default=1.25, help='razão a partir da qual se assinala uma regressão')
+    parser.add_argument('--confianca', action='store_true', help='compara o custo por turno com e sem modo de confiança')
+    args = parser.parse_args(argv)
+
+    if args.confianca:
+        compara_modo_confianca()
+        return 0
+
+    resultados = dict()
+    for nome, (prepara, repeticoes) in MEDICOES.items():
+        if args.filtro not in nome: continue
+        resultados[nome] = corre(prepara, repeticoes)
+        if not args.base: print('{:<36} {:10.3f} ms'.format(nome, resultados[nome]['mediana'] * 1000))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'python': platform.python_version(), 'seed': SEED, 'resultados': resultados}, f, indent=2)
+    if args.base:
+        with open(args.base) as f: base = json.load(f)['resultados']
+        return 1 if compara(resultados, base, args.tolerancia) else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,97 @@
+import atexit
+import json
+import os
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import wraps
+from itertools import islice
+from math import comb
+from mmap import ACCESS_READ, mmap
+from struct import pack, unpack, unpack_from
+from time import monotonic, perf_counter
+
+### Modo de confiança: quando ativo, as funções internas dos TAD deixam de
+### validar os argumentos que recebem, assumindo que foram criados pelo próprio
+### módulo. A validação mantém-se nos construtores (cria_*), em
+### str_para_coordenada e nos argumentos de minas().
+_CONFIANCA = False
+
+def define_modo_confianca(ativo):
+    """
+    (Baixo Nível)
+    Ativa ou desativa o modo de confiança, devolvendo o modo anterior
+    para que possa ser reposto
+
+    ativo (bool)  -- Novo modo
+    return (bool) -- Modo anterior
+    """
+    global _CONFIANCA
+    anterior, _CONFIANCA = _CONFIANCA, bool(ativo)
+    return anterior
+
+### Instrumentação: quando ativa, algumas operações registam em _INSTRUMENTACAO
+### o número de chamadas e o tempo gasto (em 'contagens' e 'tempos'). As
+### validações mais frequentes (eh_campo, eh_parcela) apenas são contadas.
+### Desativada, custa uma comparação com None por operação.
+_INSTRUMENTACAO = None
+
+def cria_estatisticas():
+    """ (Baixo Nível) Cria um registo de estatísticas vazio """
+    return {'contagens': dict(), 'tempos': dict()}
+
+def define_instrumentacao(e):
+    """
+    (Baixo Nível)
+    Passa a registar as estatísticas em e (ou desativa a instrumentação,
+    se e for None), devolvendo o registo anterior para que possa ser reposto
+
+    e (dict)      -- Registo de estatísticas, ou None
+    return (dict) -- Registo anterior
+    """
+    global _INSTRUMENTACAO
+    anterior, _INSTRUMENTACAO = _INSTRUMENTACAO, e
+    return anterior
+
+@contextmanager
+def instrumentacao(e=None):
+    """
+    (Alto Nível)
+    Ativa a instrumentação durante um bloco 'with', devolvendo o registo
+    de estatísticas usado. Ex: with instrumentacao() as e: minas(...)
+
+    e (dict) -- Registo de estatísticas (por omissão, um novo)
+    """
+    e = cria_estatisticas() if e is None else e
+    anterior = define_instrumentacao(e)
+    try: yield e
+    finally: define_instrumentacao(anterior)
+
+def estatisticas_para_json(e):
+    """ (Baixo Nível) Representação JSON de um registo de estatísticas """
+    return json.dumps(e, indent=2, sort_keys=True)
+
+def _conta(nome, k=1):
+    """ Soma k à contagem 'nome' do registo ativo (apenas chamada com a instrumentação ativa) """
+    contagens = _INSTRUMENTACAO['contagens']
+    contagens[nome] = contagens.get(nome, 0) + k
+
+def _instrumentada(f):
+    """ Decorador: com a instrumentação ativa, conta as chamadas de f e acumula o seu tempo """
+    nome = f.__name__
+    @wraps(f)
+    def instrumentada(*args, **kwargs):
+        e = _INSTRUMENTACAO
+        if e is None: return f(*args, **kwargs)
+        inicio = perf_counter()
+        try: return f(*args, **kwargs)
+        finally:
+            e['tempos'][nome] = e['tempos'].get(nome, 0.0) + perf_counter() - inicio
+            e['contagens'][nome] = e['contagens'].get(nome, 0) + 1
+    return instrumentada
+
 ###############
 ### Gerador ###
 ###############
@@ -41,7 +135,7 @@ def atualiza_estado(g):
     A dimensão do gerador controla o número de bits a deslocar (shift)
     g (TAD) -- Gerador
     """
-    if not eh_gerador(g): raise TypeError
+    if not _CONFIANCA and not eh_gerador(g): raise TypeError
     if g[0] == 32:
         g[1] ^= (g[1] << 13) & 0xFFFFFFFF
         g[1] ^= (g[1] >> 17) & 0xFFFFFFFF
@@ -61,7 +155,7 @@ def eh_gerador(g):
 def geradores_iguais(g1, g2):
     """ (Baixo Nível) Verifica a igualdade de dois Geradores """
     return eh_gerador(g1) and eh_gerador(g2)\
-            and gerador_para_str(g1) == gerador_para_str(g2)
+            and g1[0] == g2[0] and obtem_estado(g1) == obtem_estado(g2)
 
 def gerador_para_str(g): 
     """ (Baixo Nível) Devolve a representação do Gerador """
@@ -79,7 +173,7 @@ def gera_numero_aleatorio(g, n):
     n (int)      -- Limite superior do intervalo
     return (int) -- Número aleatório
     """
-    if not eh_gerador(g) or not isinstance(n, int) or n < 1: raise ValueError 
+    if not _CONFIANCA and (not eh_gerador(g) or not isinstance(n, int) or n < 1): raise ValueError 
     atualiza_estado(g)
     return 1 + obtem_estado(g)%n
 
@@ -96,10 +190,133 @@ def gera_carater_aleatorio(g, c):
     if ord(c) < ord('A')  or  ord(c) > ord('Z'): raise ValueError
     return chr(gera_numero_aleatorio(g, ord(c)-64)+64) # Gera um número em [65, ord(c)] sendo 65 o código ASCII de 'A'
 
+def _xorshift(b, s, k):
+    """
+    Aplica k vezes a transformação de atualiza_estado ao estado s de um
+    gerador de b bits, sem qualquer validação. Devolve um array com os
+    k estados intermédios, pela ordem em que são produzidos.
+    """
+    estados = array('Q', bytes(8 * k))
+    if b == 32: d1, d2, d3, mask = 13, 17, 5, 0xFFFFFFFF     # Deslocamentos usados por atualiza_estado
+    else:       d1, d2, d3, mask = 13, 7, 17, 0xFFFFFFFFFFFFFFFF
+    for i in range(k):
+        s ^= (s << d1) & mask
+        s ^= (s >> d2) & mask
+        s ^= (s << d3) & mask
+        estados[i] = s
+    return estados
+
+def gera_numeros_aleatorios(g, n, k):
+    """
+    (Alto Nível)
+    Gera k números aleatórios no intervalo [1, n] de uma só vez. O
+    resultado, e o estado final de g, são exatamente os mesmos que se
+    obteriam com k chamadas sucessivas a gera_numero_aleatorio(g, n),
+    mas a validação do gerador é feita uma única vez
+
+    g (TAD)       -- Gerador
+    n (int)       -- Limite superior do intervalo
+    k (int)       -- Quantidade de números a gerar
+    return (list) -- Números aleatórios
+    """
+    if not eh_gerador(g) or not isinstance(n, int) or n < 1\
+        or not isinstance(k, int) or k < 0: raise ValueError
+    if k == 0: return []
+    if obtem_estado(g) == 2 ** g[0]:    # Estado limite, que atualiza_estado deixa de aceitar após um passo
+        return [gera_numero_aleatorio(g, n) for i in range(k)]
+    estados = _xorshift(g[0], obtem_estado(g), k)
+    define_estado(g, estados[-1])
+    return [1 + s % n for s in estados]
+
+### O xorshift é linear sobre GF(2): cada passo corresponde a multiplicar o
+### estado por uma matriz de bits bxb. Uma matriz é guardada como a lista das
+### suas b colunas, cada uma um inteiro (a imagem do vetor de base 1 << j).
+_POTENCIAS_XORSHIFT = {32: [], 64: []}    # T^(2^i), calculadas apenas quando necessárias
+
+def _aplica_matriz(m, v):
+    """ Multiplica a matriz de bits m pelo vetor de bits v """
+    r, j = 0, 0
+    while v:
+        if v & 1: r ^= m[j]
+        v >>= 1
+        j += 1
+    return r
+
+def _potencia_xorshift(b, i):
+    """ Devolve a matriz de transição correspondente a 2^i passos de um gerador de b bits """
+    pot = _POTENCIAS_XORSHIFT[b]
+    if not pot: pot.append([_xorshift(b, 1 << j, 1)[0] for j in range(b)])
+    while len(pot) <= i:
+        ant = pot[-1]
+        pot.append([_aplica_matriz(ant, col) for col in ant])   # T^(2^(i+1)) = T^(2^i) * T^(2^i)
+    return pot[i]
+
+def avanca_gerador(g, n):
+    """
+    (Alto Nível)
+    Avança o estado do Gerador (g) n passos, tal como n chamadas a
+    atualiza_estado, mas em O(log n) multiplicações de matrizes de bits,
+    usando as potências de dois da matriz de transição do xorshift
+
+    g (TAD)      -- Gerador
+    n (int)      -- Número de passos
+    return (int) -- Novo estado
+    """
+    if not eh_gerador(g) or not isinstance(n, int) or n < 0: raise ValueError
+    if obtem_estado(g) == 2 ** g[0] or n < g[0]:    # Estado fora do espaço linear, ou salto curto
+        for i in range(n): atualiza_estado(g)
+        return obtem_estado(g)
+    s, i = obtem_estado(g), 0
+    while n:
+        if n & 1: s = _aplica_matriz(_potencia_xorshift(g[0], i), s)
+        n >>= 1
+        i += 1
+    return define_estado(g, s)
+
+def _mistura_semente(b, s):
+    """ Seed de b bits derivada de s (qualquer inteiro), para que seeds semelhantes deem origem a seeds sem relação """
+    return _xorshift(b, s & (1 << b) - 1 or 1, 4)[-1]
+
+def divide_gerador(g, k, comprimento=None):
+    """
+    (Alto Nível)
+    Divide a sequência do Gerador (g) em k Geradores independentes, cujas
+    sequências não se sobrepõem durante 'comprimento' passos. O i-ésimo
+    Gerador começa i * comprimento passos à frente de g, que não é alterado.
+    Por omissão o período do gerador é repartido igualmente.
+
+    g (TAD)            -- Gerador
+    k (int)            -- Número de Geradores pretendidos
+    comprimento (int)  -- Passos disponíveis para cada Gerador
+    return (tuple)     -- Geradores
+    """
+    if not eh_gerador(g) or not isinstance(k, int) or k < 1: raise ValueError
+    if comprimento is None: comprimento = (2 ** g[0] - 1) // k
+    ger, atual = [], cria_copia_gerador(g)
+    for i in range(k):
+        ger.append(cria_copia_gerador(atual))
+        if i < k - 1: avanca_gerador(atual, comprimento)
+    return tuple(ger)
+
 ########################
 ### TAD - Coordenada ###
 ########################
 
+### As Coordenadas possíveis (26x99) são criadas uma única vez, por coluna, na
+### primeira utilização, e reutilizadas: cria_coordenada devolve sempre o mesmo
+### objeto para a mesma posição. As vizinhas de cada Coordenada são também
+### guardadas, bem como, por dimensão de Campo, as vizinhas dentro do Campo.
+_COORDENADAS = dict()       # Coluna -> lista das Coordenadas da coluna, indexada pela linha
+_VIZINHAS = dict()          # Coordenada -> tuplo das Coordenadas vizinhas
+_VIZINHAS_CAMPO = dict()    # (última coluna, última linha) -> {Coordenada: vizinhas no Campo}
+
+def _coordenadas_coluna(col):
+    """ Lista das Coordenadas da coluna col, indexada pela linha (a posição 0 não é usada) """
+    if not isinstance(col, str) or len(col) != 1 or ord(col) < ord('A') or ord(col) > ord('Z'):
+        raise ValueError('cria_coordenada: argumentos invalidos')
+    _COORDENADAS[col] = [None] + [(col, lin) for lin in range(1, 100)]
+    return _COORDENADAS[col]
+
 def cria_coordenada(col,lin): 
     """
     (Baixo nível)
@@ -115,11 +332,11 @@ def cria_coordenada(col,lin):
     lin    (int) -- Inteiro da linha
     return (TAD) -- Coordenadas  
     """
-    if  not isinstance(col, str) or len(col) != 1\
-        or ord(col) < ord('A') or ord(col) > ord('Z')\
-        or not isinstance(lin, int) or lin < 1 or lin > 99: 
+    coluna = _COORDENADAS.get(col) if isinstance(col, str) else None
+    if coluna is None: coluna = _coordenadas_coluna(col)
+    if not isinstance(lin, int) or lin < 1 or lin > 99: 
         raise ValueError('cria_coordenada: argumentos invalidos')
-    return (col,lin)
+    return coluna[lin]
 
 def obtem_coluna(c): return c[0]
 
@@ -171,6 +388,8 @@ def obtem_coordenadas_vizinhas(c):
     c (TAD) -- Coordenada
     """
     if not eh_coordenada(c): return
+    viz = _VIZINHAS.get(c)
+    if viz is not None: return viz
     viz = []
     char = lambda offset: chr(ord(obtem_coluna(c))+offset)
     line = obtem_linha(c)
@@ -182,7 +401,21 @@ def obtem_coordenadas_vizinhas(c):
     ]:
         try: viz.append(cria_coordenada(i[0],i[1]))
         except ValueError: pass
-    return tuple(viz)
+    _VIZINHAS[cria_coordenada(c[0], c[1])] = viz = tuple(viz)
+    return viz
+
+def _vizinhas_campo(colunas, linhas):
+    """
+    Tabela, para um Campo com a última coluna e a última linha dadas, das
+    vizinhas de cada Coordenada que pertencem ao Campo. Criada uma única vez
+    por dimensão de Campo
+    """
+    tabela = _VIZINHAS_CAMPO.get((colunas, linhas))
+    if tabela is None:
+        tabela = _VIZINHAS_CAMPO[(colunas, linhas)] = {
+            c: tuple(v for v in obtem_coordenadas_vizinhas(c) if obtem_coluna(v) <= colunas and obtem_linha(v) <= linhas)
+            for c in (cria_coordenada(col, lin) for col in map(chr, range(65, ord(colunas)+1)) for lin in range(1, linhas+1))}
+    return tabela
 
 def obtem_coordenada_aleatoria(c, g):
     """ 
@@ -205,6 +438,39 @@ def obtem_coordenada_aleatoria(c, g):
 ### TAD - Parcela ###
 #####################
 
+### As Parcelas de um Campo compacto (ver cria_campo_compacto) não existem como
+### objetos próprios: são referências (campo, índice) para uma célula do campo,
+### um byte cujos bits indicam a existência de mina, e se está limpa ou marcada.
+_MINA, _LIMPA, _MARCADA = 1, 2, 4
+_ESTADOS_CELULA = ('#', '#', '?', 'X', '@', '@')    # Estado exterior correspondente a cada valor de célula
+_CONJUNTOS_ESTADO = (('minadas', _MINA), ('limpas', _LIMPA), ('marcadas', _MARCADA))
+
+def _eh_referencia(arg):
+    """ Verifica se um argumento é uma Parcela de um Campo compacto """
+    return isinstance(arg, tuple) and len(arg) == 2 and _eh_campo_compacto(arg[0])\
+        and isinstance(arg[1], int) and 0 <= arg[1] < len(arg[0]['celulas'])
+
+def _celula(p): return p[0]['celulas'][p[1]]
+
+def _define_celula(p, v):
+    """ Altera o valor da célula referida pela Parcela p. Todas as alterações a um Campo compacto passam por aqui """
+    m, i = p
+    antes = m['celulas'][i]
+    m['celulas'][i] = v
+    mudou = antes ^ v
+    if mudou:                   # Mantém os conjuntos de Parcelas de cada estado, e marca a linha para ser redesenhada
+        bit = 1 << (i % m['linhas'] * (ord(m['coluna'])-64) + i // m['linhas'])
+        for estado, b in _CONJUNTOS_ESTADO:
+            if mudou & b: m[estado] ^= bit
+        m['sujas'] |= 1 << i % m['linhas']
+        m['zobrist'] ^= _ZOBRIST[6 * i + antes] ^ _ZOBRIST[6 * i + v]
+    if mudou & _MINA:           # Mantém a contagem de minas vizinhas das Parcelas à volta, que aparece nas linhas adjacentes
+        delta = 1 if v & _MINA else -1
+        viz = m['vizinhas']
+        if not isinstance(viz, bytearray): viz = m['vizinhas'] = bytearray(viz)   # Partilhada com outro Campo (ver ramifica_campo)
+        for j in _indices_vizinhos(m, i): viz[j] += delta
+        m['sujas'] |= 0b111 << i % m['linhas'] >> 1
+
 def cria_parcela(): 
     """
     (Baixo Nível)
@@ -224,74 +490,94 @@ def cria_parcela():
 def cria_copia_parcela(p): 
     """
     (Baixo Nível) 
-    Retorna uma copia da Parcela
+    Retorna uma copia da Parcela. A cópia de uma Parcela de um Campo
+    compacto é uma Parcela independente desse Campo
     
     p (TAD) -- Parcela
     """
+    if _eh_referencia(p): return {'state': _ESTADOS_CELULA[_celula(p)], 'mine': _celula(p) & _MINA}
     if eh_parcela(p): return p.copy()
 
 def limpa_parcela(p):
     """ (Baixo Nível) Atualiza o estado exterior da Parcela para 'limpa' ('?') ou 'limpa minada' ('X')"""
-    if eh_parcela(p) and not eh_parcela_minada(p): 
+    if _eh_referencia(p):
+        _define_celula(p, _celula(p) & _MINA | _LIMPA)
+        return p
+    if (_CONFIANCA or eh_parcela(p)) and not eh_parcela_minada(p): 
         p.update({'state': '?'})
         return p
-    elif eh_parcela(p) and eh_parcela_minada(p): 
+    elif _CONFIANCA or eh_parcela(p): 
         p.update({'state': 'X'})
         return p
     raise ValueError
 
 def marca_parcela(p):
     """ (Baixo Nível) Atualiza o estado do exterior da Parcela para 'marcada' ('@') """
-    if eh_parcela(p): 
+    if _eh_referencia(p):
+        _define_celula(p, _celula(p) & _MINA | _MARCADA)
+        return p
+    if _CONFIANCA or eh_parcela(p): 
         p.update({'state': '@'})
         return p
     raise ValueError
 
 def desmarca_parcela(p):
     """ (Baixo Nível) Atualiza o estado do exterior da Parcela para 'tapada' ('#') """
-    if eh_parcela(p): 
+    if _eh_referencia(p):
+        _define_celula(p, _celula(p) & _MINA)
+        return p
+    if _CONFIANCA or eh_parcela(p): 
         p.update({'state': '#'})
         return p
     raise ValueError
 
 def esconde_mina(p):
     """ (Baixo Nível) Atualiza o estado do interior da Parcela para 'minada' """
-    if eh_parcela(p): 
+    if _eh_referencia(p):
+        _define_celula(p, _celula(p) | _MINA)
+        return p
+    if _CONFIANCA or eh_parcela(p): 
         p.update({'mine': 1})
         return p
     raise ValueError
 
 def eh_parcela(arg):
     """ (Baixo Nível) Verifica se um dado argumento é uma Parcela (TAD) """
+    if _INSTRUMENTACAO is not None: _conta('eh_parcela')
     if isinstance(arg, dict) and list(arg.keys()) == ['state', 'mine']\
         and arg['state'] in ['?', '@', '#', 'X'] and arg['mine'] in [0,1]:
             return True
-    return False
+    return _eh_referencia(arg)
 
 ### As seguintes funções de baixo nível verificam a primeira propriedade da parcela
 def eh_parcela_limpa(p): 
-    if not eh_parcela(p): raise ValueError 
+    if _eh_referencia(p): return _celula(p) & _LIMPA != 0
+    if not _CONFIANCA and not eh_parcela(p): raise ValueError 
     return p['state'] == '?' or p['state'] == 'X'
 def eh_parcela_marcada(p): 
-    if not eh_parcela(p): raise ValueError 
+    if _eh_referencia(p): return _celula(p) & _MARCADA != 0
+    if not _CONFIANCA and not eh_parcela(p): raise ValueError 
     return p['state'] == '@'
 def eh_parcela_tapada(p):
-    if not eh_parcela(p): raise ValueError 
+    if _eh_referencia(p): return _celula(p) & (_LIMPA | _MARCADA) == 0
+    if not _CONFIANCA and not eh_parcela(p): raise ValueError 
     return p['state'] == '#'  
 ### A seguinte função de baixo nível verifica a segunda propriedade da parcela  
 def eh_parcela_minada(p): 
-    if not eh_parcela(p): raise ValueError 
+    if _eh_referencia(p): return _celula(p) & _MINA != 0
+    if not _CONFIANCA and not eh_parcela(p): raise ValueError 
     return p['mine'] == 1
 
 def parcelas_iguais(p1,p2):
     """ (Baixo Nível) Verifica a igualdade de duas parcelas"""
     if not eh_parcela(p1) or not eh_parcela(p2): return False
-    if p1 == p2: return True
+    if cria_copia_parcela(p1) == cria_copia_parcela(p2): return True
     return False
 
 def parcela_para_str(p):
     """ (Baixo Nível) Retorna uma representação do estado da parcela"""
     if eh_parcela_limpa(p) and eh_parcela_minada(p): return 'X'
+    elif _eh_referencia(p): return _ESTADOS_CELULA[_celula(p)]
     elif eh_parcela(p): return p['state']
     raise TypeError
 
@@ -338,6 +624,106 @@ def cria_campo(c, l):
             minefield.update({chr(col): [cria_parcela() for i in range(l)]})
     return minefield
 
+def cria_campo_compacto(c, l):
+    """
+    (Baixo Nível)
+    Alternativa a cria_campo, com as mesmas funções do TAD, em que o campo
+    guarda todas as Parcelas num único bytearray, um byte por Parcela, em
+    vez de um dicionário por Parcela. A Parcela na coluna col e linha lin
+    encontra-se no índice (ord(col)-65) * l + lin-1. Cada byte combina os
+    bits _MINA, _LIMPA e _MARCADA; um byte a 0 é uma Parcela tapada.
+    O campo mantém ainda, para cada Parcela, o número de minas vizinhas,
+    atualizado sempre que uma mina é escondida, e o conjunto das Parcelas
+    minadas, limpas e marcadas. Cada conjunto é um inteiro usado como
+    mapa de bits, em que a Parcela na coluna col e linha lin corresponde
+    ao bit (lin-1) * colunas + ord(col)-65, pela ordem de obtem_coordenadas.
+    Por fim, guarda a última representação de cada linha, num tuplo (ver
+    campo_para_str), o mapa de bits das linhas alteradas desde então, e
+    o hash de Zobrist das células (ver chave_campo).
+
+    Ex. Meramente Illustrativo de um campo 3x3
+
+        {'coluna': 'C', 'linhas': 3, 'celulas': bytearray(9), 'vizinhas': bytearray(9),
+         'minadas': 0, 'limpas': 0, 'marcadas': 0, 'desenho': None, 'sujas': 0b111, 'zobrist': 0}
+
+    c (str) -- Colunas pretendidas
+    l (int) -- Linhas pretendidas
+    """
+    try:  cria_coordenada(c,l)
+    except: raise ValueError('cria_campo_compacto: argumentos invalidos')
+    if _ZOBRIST is None: _cria_chaves_zobrist()
+    return {'coluna': c, 'linhas': l, 'celulas': bytearray((ord(c)-64) * l), 'vizinhas': bytearray((ord(c)-64) * l),
+            'minadas': 0, 'limpas': 0, 'marcadas': 0, 'desenho': None, 'sujas': (1 << l) - 1, 'zobrist': 0}
+
+_CHAVES_CAMPO_COMPACTO = ('coluna', 'linhas', 'celulas', 'vizinhas', 'minadas', 'limpas', 'marcadas', 'desenho', 'sujas', 'zobrist')
+
+### Hash de Zobrist: cada par (índice, valor de célula) tem uma chave aleatória
+### de 64 bits, e o hash de um Campo compacto é o xor das chaves das suas
+### células, sendo nula a chave de uma Parcela tapada (valor 0). Alterar uma
+### célula atualiza o hash com dois xor. As chaves são produzidas por um
+### Gerador de seed fixa, pelo que são as mesmas em qualquer processo.
+_ZOBRIST = None     # Chave do valor v no índice i em _ZOBRIST[6 * i + v], criadas com o primeiro Campo compacto
+
+def _cria_chaves_zobrist():
+    """ Cria as chaves de Zobrist para todos os índices de um Campo Z99 """
+    global _ZOBRIST
+    chaves = _xorshift(64, 0x9E3779B97F4A7C15, 26 * 99 * len(_ESTADOS_CELULA))
+    for i in range(0, len(chaves), len(_ESTADOS_CELULA)): chaves[i] = 0
+    _ZOBRIST = chaves
+
+def _eh_campo_compacto(arg):
+    """ Distingue um Campo criado por cria_campo_compacto """
+    return isinstance(arg, dict) and 'celulas' in arg
+
+def _indice(m, c):
+    """
+    Índice da Coordenada c no bytearray de um Campo compacto. Fora do Campo
+    levanta os mesmos erros que o Campo em dicionário (KeyError para a
+    coluna, IndexError para a linha), em vez de cair noutra Parcela
+    """
+    col, lin = obtem_coluna(c), obtem_linha(c)
+    if col > m['coluna']: raise KeyError(col)
+    if lin > m['linhas']: raise IndexError('list index out of range')
+    return (ord(col)-65) * m['linhas'] + lin-1
+
+def _recalcula_campo_compacto(m):
+    """ Reconstrói a informação derivada de um Campo compacto (minas vizinhas, conjuntos de estados, desenho e hash) a partir das células """
+    celulas, linhas, colunas = m['celulas'], m['linhas'], ord(m['coluna']) - 64
+    viz, bits = bytearray(len(celulas)), {estado: bytearray(b'0' * len(celulas)) for estado, b in _CONJUNTOS_ESTADO}
+    zobrist = 0
+    for i, v in enumerate(celulas):
+        if not v: continue
+        zobrist ^= _ZOBRIST[6 * i + v]
+        for estado, b in _CONJUNTOS_ESTADO:
+            if v & b: bits[estado][i % linhas * colunas + i // linhas] = ord('1')
+        if v & _MINA:
+            for j in _indices_vizinhos(m, i): viz[j] += 1
+    m['vizinhas'] = viz
+    for estado, b in _CONJUNTOS_ESTADO: m[estado] = int(bits[estado][::-1], 2)
+    m['desenho'], m['sujas'], m['zobrist'] = None, (1 << linhas) - 1, zobrist
+    return m
+
+_INDICES_VIZINHOS = dict()  # (colunas, linhas) -> tuplo, por índice, dos índices vizinhos num Campo compacto
+
+def _indices_vizinhos(m, i):
+    """ Índices das Parcelas vizinhas do índice i num Campo compacto """
+    tabela = _INDICES_VIZINHOS.get((m['coluna'], m['linhas']))
+    if tabela is None: tabela = _tabela_indices_vizinhos(m['coluna'], m['linhas'])
+    return tabela[i]
+
+def _tabela_indices_vizinhos(coluna, linhas):
+    """ Cria e guarda a tabela dos índices vizinhos de todas as Parcelas de um Campo compacto """
+    total, tabela = (ord(coluna) - 64) * linhas, []
+    for i in range(total):
+        lin, viz = i % linhas, []
+        for dc in (-linhas, 0, linhas):
+            for dl in (-1, 0, 1):
+                j = i + dc + dl
+                if (dc or dl) and 0 <= j < total and 0 <= lin + dl < linhas: viz.append(j)
+        tabela.append(tuple(viz))
+    _INDICES_VIZINHOS[(coluna, linhas)] = tabela = tuple(tabela)
+    return tabela
+
 def cria_copia_campo(m):
     """ 
     (Baixo Nível) 
@@ -345,18 +731,39 @@ def cria_copia_campo(m):
     
     m (TAD) -- Campo de Minas
     """
+    if _eh_campo_compacto(m): return ramifica_campo(m)
     copy = cria_campo(obtem_ultima_coluna(m), obtem_ultima_linha(m))
     for c in obtem_coordenadas(m, 'minadas'): esconde_mina(obtem_parcela(copy, c))
     for c in obtem_coordenadas(m, 'marcadas'): marca_parcela(obtem_parcela(copy, c))
     for c in obtem_coordenadas(m, 'limpas'): limpa_parcela(obtem_parcela(copy, c))
     return copy
     
+def ramifica_campo(m):
+    """
+    (Baixo Nível)
+    Devolve uma cópia independente do Campo, tal como cria_copia_campo,
+    mas tão barata quanto possível. Num Campo compacto copia-se apenas o
+    bytearray das células; as contagens de minas vizinhas e o desenho são
+    partilhados, em versões imutáveis, e só são copiados pelo Campo que
+    os alterar primeiro. Os restantes Campos são copiados integralmente.
+
+    m (TAD)      -- Campo de Minas
+    return (TAD) -- Cópia do Campo
+    """
+    if not _eh_campo_compacto(m): return cria_copia_campo(m)
+    if isinstance(m['vizinhas'], bytearray): m['vizinhas'] = bytes(m['vizinhas'])   # Passa a ser partilhada
+    copy = m.copy()     # Os conjuntos de estados são inteiros, e o desenho um tuplo, ambos imutáveis
+    copy['celulas'] = m['celulas'][:]
+    return copy
+
 def obtem_ultima_coluna(m):
     """ (Baixo Nível) """
+    if _eh_campo_compacto(m): return m['coluna']
     return list(m.keys())[-1]
 
 def obtem_ultima_linha(m): 
     """ (Baixo Nível) """
+    if _eh_campo_compacto(m): return m['linhas']
     return len(m['A'])
 
 def obtem_parcela(m, c):
@@ -367,6 +774,7 @@ def obtem_parcela(m, c):
     m (TAD) -- Campo de Minas
     c (TAD) -- Coordenadas
     """
+    if _eh_campo_compacto(m): return (m, _indice(m, c))
     return (m[obtem_coluna(c)])[obtem_linha(c)-1]
 
 def obtem_coordenadas(m, s):
@@ -380,6 +788,7 @@ def obtem_coordenadas(m, s):
     m (TAD) -- Campo de Minas
     s (str) -- Estado selecionado
     """
+    if _eh_campo_compacto(m): return _obtem_coordenadas_compacto(m, s)
 
     coords = list()
     for l in range(0, obtem_ultima_linha(m)):
@@ -393,6 +802,37 @@ def obtem_coordenadas(m, s):
                     coords.append(current)
     return tuple(coords)
 
+def _obtem_coordenadas_compacto(m, s):
+    """ obtem_coordenadas sobre um Campo compacto, percorrendo apenas os bits do conjunto do estado s """
+    return _coordenadas_bits(m, _conjunto_estado(m, s))
+
+def _coordenadas_bits(m, bits):
+    """ Coordenadas das Parcelas de um mapa de bits de um Campo compacto, pela ordem de obtem_coordenadas """
+    colunas = ord(m['coluna']) - 64
+    bits = bin(bits)[:1:-1]                     # Do bit menos significativo para o mais significativo
+    coords, b = list(), bits.find('1')
+    while b != -1:
+        coords.append(cria_coordenada(chr(b % colunas + 65), b // colunas + 1))
+        b = bits.find('1', b + 1)
+    return tuple(coords)
+
+def _conjunto_estado(m, s):
+    """ Mapa de bits das Parcelas de um Campo compacto no estado s """
+    if s == 'tapadas': return ~(m['limpas'] | m['marcadas']) & ((1 << len(m['celulas'])) - 1)
+    return m[s]
+
+def conta_coordenadas(m, s):
+    """
+    (Baixo Nível)
+    Devolve o número de Parcelas do Campo 'm' no estado 's', isto é,
+    len(obtem_coordenadas(m, s)), sem construir as Coordenadas
+
+    m (TAD) -- Campo de Minas
+    s (str) -- Estado selecionado
+    """
+    if _eh_campo_compacto(m): return _conjunto_estado(m, s).bit_count()
+    return len(obtem_coordenadas(m, s))
+
 def obtem_numero_minas_vizinhas(m, c):
     """
     (Baixo Nível)
@@ -403,6 +843,7 @@ def obtem_numero_minas_vizinhas(m, c):
     c (TAD) -- Coordenada
     """
     if not eh_coordenada_do_campo(m, c): raise TypeError
+    if _eh_campo_compacto(m): return m['vizinhas'][_indice(m, c)]
     count = 0
     for coord in obtem_coordenadas_vizinhas(c):
         if eh_coordenada_do_campo(m, coord) and eh_parcela_minada(obtem_parcela(m, coord)): count += 1
@@ -410,6 +851,15 @@ def obtem_numero_minas_vizinhas(m, c):
 
 def eh_campo(arg):
     """ (Baixo Nível) Verifica se um dado argumento é um Campo de Minas (TAD) """
+    if _INSTRUMENTACAO is not None: _conta('eh_campo')
+    if _eh_campo_compacto(arg):
+        return tuple(arg.keys()) == _CHAVES_CAMPO_COMPACTO\
+            and eh_coordenada((arg['coluna'], arg['linhas'])) and all(isinstance(arg[e], int) for e, b in _CONJUNTOS_ESTADO)\
+            and isinstance(arg['celulas'], bytearray) and len(arg['celulas']) == (ord(arg['coluna'])-64) * arg['linhas']\
+            and isinstance(arg['vizinhas'], (bytearray, bytes)) and len(arg['vizinhas']) == len(arg['celulas'])\
+            and (arg['desenho'] is None or isinstance(arg['desenho'], tuple)) and isinstance(arg['sujas'], int)\
+            and isinstance(arg['zobrist'], int)\
+            and max(arg['celulas']) < len(_ESTADOS_CELULA)
     def keys(arg):
         for k in arg.keys():
             if not isinstance(k, str) or ord('A') > ord(k) or ord('Z') < ord(k): return False
@@ -429,17 +879,88 @@ def eh_coordenada_do_campo(m, c):
     m (TAD) -- Campo de Minas
     c (TAD) -- Coordenada
     """
-    return eh_campo(m) and eh_coordenada(c)\
+    return (_CONFIANCA or eh_campo(m)) and eh_coordenada(c)\
         and ord(obtem_coluna(c)) <= ord(obtem_ultima_coluna(m))\
         and obtem_linha(c) <= obtem_ultima_linha(m)
 
 def campos_iguais(m1, m2):
     """ (Baixo Nível) Verifica a igualdade de dois campos """
+    if _eh_campo_compacto(m1) and _eh_campo_compacto(m2):
+        return m1['zobrist'] == m2['zobrist'] and m1['coluna'] == m2['coluna'] and m1['linhas'] == m2['linhas']\
+            and m1['celulas'] == m2['celulas']
     def check(estado):
         return obtem_coordenadas(m1,estado) == obtem_coordenadas(m2, estado)
     return check('minadas') and check('tapadas') and check('marcadas') and check('limpas')
 
+def chave_campo(m):
+    """
+    (Baixo Nível)
+    Devolve uma chave imutável (e portanto utilizável num dicionário ou
+    conjunto) que identifica a posição do Campo: as dimensões e o hash de
+    Zobrist das Parcelas. Num Campo compacto o hash é mantido a cada
+    alteração, e obter a chave é O(1); nos restantes é calculado.
+    Dois Campos diferentes só têm a mesma chave por colisão do hash (64 bits).
+
+    m (TAD)        -- Campo de Minas
+    return (tuple) -- Chave do Campo
+    """
+    if _eh_campo_compacto(m): return (m['coluna'], m['linhas'], m['zobrist'])
+    if not eh_campo(m): raise ValueError('chave_campo: argumentos invalidos')
+    if _ZOBRIST is None: _cria_chaves_zobrist()
+    coluna, linhas, zobrist = obtem_ultima_coluna(m), obtem_ultima_linha(m), 0
+    for i, (col, lin) in enumerate((col, lin) for col in map(chr, range(65, ord(coluna)+1)) for lin in range(1, linhas+1)):
+        p = obtem_parcela(m, cria_coordenada(col, lin))     # Pela ordem das células de um Campo compacto
+        v = (_MINA if eh_parcela_minada(p) else 0) | (_LIMPA if eh_parcela_limpa(p) else _MARCADA if eh_parcela_marcada(p) else 0)
+        zobrist ^= _ZOBRIST[6 * i + v]
+    return (coluna, linhas, zobrist)
+
+def cria_tabela_transposicao(maximo=1 << 20):
+    """
+    (Baixo Nível)
+    Cria uma tabela de transposição: associa posições de Campos (pela sua
+    chave, ver chave_campo) a valores, guardando no máximo 'maximo'
+    posições. Quando cheia, esquece a posição consultada há mais tempo.
+
+    maximo (int)  -- Número máximo de posições
+    return (dict) -- Tabela de transposição
+    """
+    if not isinstance(maximo, int) or maximo < 1: raise ValueError('cria_tabela_transposicao: argumentos invalidos')
+    return {'entradas': OrderedDict(), 'maximo': maximo}
+
+def regista_transposicao(t, m, valor=None):
+    """
+    (Baixo Nível)
+    Associa a posição do Campo m ao valor dado. Devolve True se a posição
+    ainda não estava na tabela, permitindo eliminar posições repetidas
 
+    t (dict)      -- Tabela de transposição
+    m (TAD)       -- Campo de Minas
+    valor         -- Valor a associar
+    return (bool) -- Se a posição é nova
+    """
+    entradas, chave = t['entradas'], chave_campo(m)
+    nova = chave not in entradas
+    entradas[chave] = valor
+    if nova:
+        if len(entradas) > t['maximo']: entradas.popitem(last=False)
+    else: entradas.move_to_end(chave)
+    return nova
+
+def obtem_transposicao(t, m, omissao=None):
+    """
+    (Baixo Nível)
+    Devolve o valor associado à posição do Campo m, ou 'omissao' se a
+    posição não está na tabela
+
+    t (dict) -- Tabela de transposição
+    m (TAD)  -- Campo de Minas
+    """
+    entradas, chave = t['entradas'], chave_campo(m)
+    if chave not in entradas: return omissao
+    entradas.move_to_end(chave)
+    return entradas[chave]
+
+@_instrumentada
 def campo_para_str(m):
     """ 
     (Baixo Nível)
@@ -457,6 +978,8 @@ def campo_para_str(m):
     m (TAD) -- Campo de Minas
     c (TAD) -- Coordenada
     """
+    if _eh_campo_compacto(m): return _campo_para_str_compacto(m)
+
     def mine_counter(m, c):
         """ Conta as minas adjacentes a uma dada Parcela """
         count = 0
@@ -472,7 +995,7 @@ def campo_para_str(m):
         linestr = ''
         for line in range(1, obtem_ultima_linha(m)+1):
             p = ''
-            for col in list(m.keys()):
+            for col in map(chr, range(65, ord(obtem_ultima_coluna(m))+1)):
                 square = obtem_parcela(m,cria_coordenada(col, line))
                 if eh_parcela_limpa(square) and not eh_parcela_minada(square): # Potencía a representação gráfica do número de minas na vizinhança
                     p += mine_counter(m, cria_coordenada(col, line))
@@ -492,27 +1015,148 @@ def campo_para_str(m):
          + line_str(m) \
          + separator
 
-def coloca_minas(m, c, g, n):
+_DESENHO_LIMPA = ' 12345678'   # Representação de uma Parcela limpa, pelo número de minas vizinhas
+
+def _desenha_linhas(m):
+    """
+    Redesenha as linhas de um Campo compacto alteradas desde o último
+    desenho, guardando-as em m['desenho']. Devolve a lista dos índices
+    (a partir de 0) das linhas redesenhadas
+    """
+    linhas, colunas = m['linhas'], ord(m['coluna']) - 64
+    celulas, viz = m['celulas'], m['vizinhas']
+    desenho = [None] * linhas if m['desenho'] is None else list(m['desenho'])
+    sujas = bin(m['sujas'] & ((1 << linhas) - 1))[:1:-1]
+    m['sujas'] = 0
+    redesenhadas, l = [], sujas.find('1')
+    while l != -1:
+        linha = []
+        for i in range(l, colunas * linhas, linhas):
+            v = celulas[i]
+            linha.append(_DESENHO_LIMPA[viz[i]] if v & (_LIMPA | _MINA) == _LIMPA else _ESTADOS_CELULA[v])
+        desenho[l] = '{:02d}|{}|'.format(l + 1, ''.join(linha))
+        redesenhadas.append(l)
+        l = sujas.find('1', l + 1)
+    if redesenhadas: m['desenho'] = tuple(desenho)  # Imutável, para poder ser partilhado entre Campos ramificados
+    return redesenhadas
+
+def _campo_para_str_compacto(m):
+    """ campo_para_str sobre um Campo compacto, redesenhando apenas as linhas alteradas """
+    _desenha_linhas(m)
+    colunas = ord(m['coluna']) - 64
+    separator = '  +' + '-'*colunas + '+'
+    return '\n'.join(['   ' + ''.join(map(chr, range(65, 65 + colunas))), separator, *m['desenho'], separator])
+
+@_instrumentada
+def campo_para_ansi(m, origem=1):
+    """
+    (Baixo Nível)
+    Devolve as sequências de escape ANSI que atualizam, num terminal, a
+    representação de um Campo compacto desenhada por campo_para_str (ou
+    por chamadas anteriores desta função), reescrevendo apenas as
+    Parcelas que mudaram desde então. A posição do cursor é preservada.
+    Se o Campo nunca foi desenhado, devolve o desenho completo.
+
+    m (TAD)      -- Campo de Minas compacto
+    origem (int) -- Linha do terminal onde se encontra o cabeçalho do desenho
+    return (str) -- Sequências de escape
+    """
+    if not _eh_campo_compacto(m): raise ValueError('campo_para_ansi: argumentos invalidos')
+    if m['desenho'] is None: return '\x1b7\x1b[{};1H{}\x1b8'.format(origem, campo_para_str(m))
+    anteriores = m['desenho']
+    saida = ['\x1b7']
+    for l in _desenha_linhas(m):
+        antes, agora, c = anteriores[l], m['desenho'][l], 0
+        while c < len(agora):
+            if antes[c] == agora[c]:
+                c += 1
+                continue
+            fim = c
+            while fim < len(agora) and antes[fim] != agora[fim]: fim += 1
+            saida.append('\x1b[{};{}H{}'.format(origem + 2 + l, c + 1, agora[c:fim]))
+            c = fim
+    saida.append('\x1b8')
+    return ''.join(saida) if len(saida) > 2 else ''
+
+def parcelas_alteradas(m):
+    """
+    (Baixo Nível)
+    Devolve as Parcelas de um Campo compacto cuja representação mudou desde
+    o último desenho (por campo_para_str, campo_para_ansi ou esta função),
+    num tuplo de pares (Coordenada, carater), ordenados por linha e depois
+    por coluna. Se o Campo nunca foi desenhado, devolve todas as Parcelas.
+
+    m (TAD)        -- Campo de Minas compacto
+    return (tuple) -- Pares (Coordenada, carater)
+    """
+    if not _eh_campo_compacto(m): raise ValueError('parcelas_alteradas: argumentos invalidos')
+    anteriores, alteradas = m['desenho'], []
+    for l in _desenha_linhas(m):
+        agora = m['desenho'][l]
+        for k in range(3, len(agora) - 1):      # Depois de 'NN|', até ao '|' final
+            if anteriores is None or anteriores[l][k] != agora[k]:
+                alteradas.append((cria_coordenada(chr(62 + k), l + 1), agora[k]))
+    return tuple(alteradas)
+
+_MODOS_COLOCACAO = ('gerador', 'fisher-yates', 'sem-palpites')
+
+@_instrumentada
+def coloca_minas(m, c, g, n, modo='gerador'):
     """
     (Alto Nível)
     Modifica o Campo 'm' minando aleatoreamente 'n' Parcelas unicas, 
     evitando a Coordenada c e a sua vizinhança de modo a garantir uma
     primeira jogada segura
 
-    m (TAD) -- Campo de Minas
-    c (TAD) -- Coordenada
-    g (TAD) -- Gerador
-    n (int) -- Numero de parcelas a minar
+    Modos de colocação:
+        'gerador'      -- Gera Coordenadas até encontrar n Parcelas válidas
+                          (por omissão, reproduz os Campos de seeds anteriores)
+        'fisher-yates' -- Baralha parcialmente as Parcelas elegíveis, com
+                          exatamente n números aleatórios, sem rejeições
+        'sem-palpites' -- Apenas Campos que se resolvem sem palpites a
+                          partir de c (ver gera_minas_sem_palpites). Se a
+                          procura esgotar _TENTATIVAS_SEM_PALPITES candidatos
+                          ou _TEMPO_SEM_PALPITES segundos, as minas são
+                          colocadas como no modo 'gerador'
+
+    m (TAD)    -- Campo de Minas
+    c (TAD)    -- Coordenada
+    g (TAD)    -- Gerador
+    n (int)    -- Numero de parcelas a minar
+    modo (str) -- Modo de colocação
     """
-    exclzone = list(obtem_coordenadas_vizinhas(c)) +[c,]    # Garante uma primeira jogada segura
+    if modo == 'fisher-yates': return _coloca_minas_baralho(m, c, g, n)
+    if modo == 'sem-palpites': return _coloca_minas_sem_palpites(m, c, g, n)
+    if modo != 'gerador': raise ValueError('coloca_minas: argumentos invalidos')
+    exclzone = set(obtem_coordenadas_vizinhas(c)) | {c,}    # Garante uma primeira jogada segura
     while n > 0:
         target = cria_coordenada(gera_carater_aleatorio(g,obtem_ultima_coluna(m)), gera_numero_aleatorio(g,obtem_ultima_linha(m)))
         if target not in exclzone:
             esconde_mina(obtem_parcela(m,target))
-            exclzone.append(target)
+            exclzone.add(target)
             n -= 1
+        elif _INSTRUMENTACAO is not None: _conta('coloca_minas.rejeitadas')
     return m
 
+def _coloca_minas_baralho(m, c, g, n):
+    """
+    Colocação de minas por Fisher-Yates parcial: as Parcelas elegíveis são
+    numeradas pela ordem de obtem_coordenadas, e em cada passo i troca-se
+    a posição i com uma posição aleatória em [i, fim], ficando minadas as
+    primeiras n posições
+    """
+    colunas, linhas = ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m)
+    exclzone = {(ord(obtem_coluna(v)) - 65) + (obtem_linha(v) - 1) * colunas for v in obtem_coordenadas_vizinhas(c) + (c,)
+                if ord(obtem_coluna(v)) - 64 <= colunas and obtem_linha(v) <= linhas}    # As vizinhas fora do Campo não têm índice
+    elegiveis = array('H', (i for i in range(colunas * linhas) if i not in exclzone))
+    if not isinstance(n, int) or n > len(elegiveis): raise ValueError('coloca_minas: argumentos invalidos')
+    for i in range(n):
+        j = i + gera_numero_aleatorio(g, len(elegiveis) - i) - 1
+        elegiveis[i], elegiveis[j] = elegiveis[j], elegiveis[i]
+        esconde_mina(obtem_parcela(m, cria_coordenada(chr(elegiveis[i] % colunas + 65), elegiveis[i] // colunas + 1)))
+    return m
+
+@_instrumentada
 def limpa_campo(m, c):
     """
     (Alto Nível)
@@ -520,18 +1164,583 @@ def limpa_campo(m, c):
     devlove o Campo
 
     m (TAD) -- Campo de Minas
-    c (TAD) -- Coordenada
+    c (TAD) -- Coordenada (num Campo por blocos, um par de inteiros)
+    """
+    if _eh_campo_blocos(m): return _limpa_campo_blocos(m, c)
+    p = obtem_parcela(m, c)                                 # Fora do Campo levanta erro, antes de qualquer alteração
+    if not eh_coordenada_do_campo(m, c): return m
+    limpa_parcela(p)                                        # Limpa a Coordenada pretendida
+    if eh_parcela_minada(p): return m                       # Não efetua limpeza da vizinhanca caso a parcela seja minada
+    return _limpa_vizinhanca(m, (c,))
+
+@_instrumentada
+def limpa_campo_batch(m, coords):
+    """
+    (Alto Nível)
+    Equivalente a chamar limpa_campo para cada uma das Coordenadas,
+    mas com uma única limpeza da vizinhança para todas elas. Devolve o Campo
+
+    m (TAD)        -- Campo de Minas
+    coords (tuple) -- Coordenadas a limpar
+    """
+    if not eh_campo(m): raise ValueError('limpa_campo_batch: argumentos invalidos')
+    sementes = []
+    for c in coords:
+        if not eh_coordenada(c) or ord(obtem_coluna(c)) > ord(obtem_ultima_coluna(m))\
+            or obtem_linha(c) > obtem_ultima_linha(m): raise ValueError('limpa_campo_batch: argumentos invalidos')
+        p = limpa_parcela(obtem_parcela(m, c))
+        if not eh_parcela_minada(p): sementes.append(c)
+    return _limpa_vizinhanca(m, sementes)
+
+def _limpa_vizinhanca(m, sementes):
+    """
+    Limpa, a partir das Coordenadas sementes (já limpas), todas as Parcelas
+    ligadas por Parcelas sem minas vizinhas. A pesquisa é feita em largura,
+    com uma fila em vez de recursão, e as Parcelas já visitadas são
+    registadas num bytearray indexado como num Campo compacto. O Campo é
+    validado por quem chama, e não a cada Parcela.
+    """
+    colunas, linhas = ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m)
+    indice = lambda c: (ord(obtem_coluna(c))-65) * linhas + obtem_linha(c)-1
+    vizinhas = _vizinhas_campo(obtem_ultima_coluna(m), linhas)
+
+    def minas_vizinhas(c):
+        if _eh_campo_compacto(m): return m['vizinhas'][indice(c)]
+        return sum(1 for v in vizinhas[c] if eh_parcela_minada(obtem_parcela(m, v)))
+
+    visitadas, fila = bytearray(colunas * linhas), deque()
+    for c in sementes:
+        if not visitadas[indice(c)]:
+            visitadas[indice(c)] = 1
+            fila.append(c)
+    while fila:
+        c = fila.popleft()
+        if minas_vizinhas(c) != 0: continue             # Apenas as Parcelas sem minas vizinhas propagam a limpeza
+        for v in vizinhas[c]:
+            if visitadas[indice(v)]: continue
+            p = obtem_parcela(m, v)
+            if not eh_parcela_minada(p) and eh_parcela_tapada(p):
+                limpa_parcela(p)
+                visitadas[indice(v)] = 1
+                fila.append(v)
+    if _INSTRUMENTACAO is not None: _conta('limpa_campo.visitadas', sum(visitadas))
+    return m
+
+##########################
+### Campo por blocos   ###
+##########################
+
+### Um Campo por blocos não tem limites: as posições são pares de inteiros
+### (coluna, linha), sem restrições, e o Campo é dividido em blocos quadrados
+### de tamanho x tamanho Parcelas, criados apenas quando são consultados. As
+### minas de cada bloco são colocadas por um Gerador próprio, cuja seed é
+### derivada da seed do Campo e da posição do bloco, pelo que um bloco é
+### sempre recriado da mesma forma. Os blocos ainda sem Parcelas limpas ou
+### marcadas podem, por isso, ser esquecidos: são guardados por ordem de
+### utilização, e apenas os 'maximo' mais recentes são mantidos. Os blocos
+### alterados são sempre mantidos, pelo que a memória ocupada acompanha a
+### zona explorada e não a dimensão do Campo. As células usam os mesmos bits
+### das de um Campo compacto.
+_MAXIMO_LIMPEZA = 1 << 20   # Parcelas limpas, no máximo, por uma única limpeza num Campo por blocos
+
+def cria_campo_blocos(s, densidade, d=64, tamanho=32, maximo=1024, inicio=(0, 0)):
+    """
+    (Baixo Nível)
+    Cria um Campo por blocos. Cada bloco tem round(densidade * tamanho²)
+    minas, exceto na vizinhança da posição inicio, que não tem minas, de
+    modo a garantir uma primeira jogada segura (os blocos que a contêm
+    ficam com menos minas, se não houver Parcelas suficientes).
+
+    s (int)           -- Seed do Campo
+    densidade (float) -- Fração das Parcelas minadas, entre 0 e 1 (exclusive)
+    d (int)           -- Dimensão dos Geradores (32/64 bits)
+    tamanho (int)     -- Lado de cada bloco, entre 2 e 256
+    maximo (int)      -- Número de blocos não alterados a manter
+    inicio (tuple)    -- Posição da primeira jogada
+    return (dict)     -- Campo por blocos
+    """
+    try:
+        cria_gerador(d, s)
+        if not isinstance(densidade, (int, float)) or not 0 < densidade < 1 or not isinstance(tamanho, int) or not 2 <= tamanho <= 256\
+            or not isinstance(maximo, int) or maximo < 1 or not _eh_posicao(inicio): raise ValueError
+    except: raise ValueError('cria_campo_blocos: argumentos invalidos')
+    return {'seed': s, 'bits': d, 'tamanho': tamanho, 'minas': round(densidade * tamanho * tamanho), 'inicio': tuple(inicio),
+            'maximo': maximo, 'blocos': OrderedDict(), 'alterados': dict()}
+
+def _eh_campo_blocos(arg):
+    """ Distingue um Campo criado por cria_campo_blocos """
+    return isinstance(arg, dict) and 'blocos' in arg
+
+def _eh_posicao(arg):
+    """ Verifica se um argumento é uma posição de um Campo por blocos """
+    return isinstance(arg, tuple) and len(arg) == 2 and all(type(x) is int for x in arg)
+
+def _semente_bloco(m, bx, by):
+    """ Seed do Gerador do bloco (bx, by), derivada da seed do Campo """
+    return _mistura_semente(m['bits'], m['seed'] ^ bx * 0x9E3779B97F4A7C15 ^ by * 0xC2B2AE3D27D4EB4F)
+
+def _gera_bloco(m, bx, by):
+    """ Cria as células do bloco (bx, by), por Fisher-Yates parcial, como em coloca_minas """
+    t, (ic, il) = m['tamanho'], m['inicio']
+    col0, lin0 = bx * t, by * t
+    exclzone = {(c - col0) * t + l - lin0 for c in range(ic - 1, ic + 2) for l in range(il - 1, il + 2)
+                if col0 <= c < col0 + t and lin0 <= l < lin0 + t}
+    elegiveis = array('I', (i for i in range(t * t) if i not in exclzone))
+    celulas, g = bytearray(t * t), cria_gerador(m['bits'], _semente_bloco(m, bx, by))
+    anterior = define_modo_confianca(True)
+    try:
+        for i in range(min(m['minas'], len(elegiveis))):    # O bloco da posição inicial pode não ter lugar para todas
+            j = i + gera_numero_aleatorio(g, len(elegiveis) - i) - 1
+            elegiveis[i], elegiveis[j] = elegiveis[j], elegiveis[i]
+            celulas[elegiveis[i]] = _MINA
+    finally: define_modo_confianca(anterior)
+    return celulas
+
+def _bloco(m, bx, by):
+    """ Células do bloco (bx, by), criando-o se necessário e esquecendo o bloco não alterado usado há mais tempo """
+    celulas = m['alterados'].get((bx, by))
+    if celulas is not None: return celulas
+    blocos = m['blocos']
+    celulas = blocos.get((bx, by))
+    if celulas is None:
+        celulas = blocos[(bx, by)] = _gera_bloco(m, bx, by)
+        if len(blocos) > m['maximo']: blocos.popitem(last=False)
+    else: blocos.move_to_end((bx, by))
+    return celulas
+
+def _valor_blocos(m, c):
+    """ Valor da célula na posição c de um Campo por blocos """
+    t, (col, lin) = m['tamanho'], c
+    return _bloco(m, col // t, lin // t)[col % t * t + lin % t]
+
+def _define_valor_blocos(m, c, v):
+    """ Altera o valor da célula na posição c, passando o seu bloco a ser mantido """
+    t, (col, lin) = m['tamanho'], c
+    bx, by = col // t, lin // t
+    if (bx, by) not in m['alterados']:
+        _bloco(m, bx, by)
+        m['alterados'][(bx, by)] = m['blocos'].pop((bx, by))
+    m['alterados'][(bx, by)][col % t * t + lin % t] = v
+
+def _vizinhas_blocos(c):
+    col, lin = c
+    return ((col-1, lin-1), (col, lin-1), (col+1, lin-1), (col+1, lin), (col+1, lin+1), (col, lin+1), (col-1, lin+1), (col-1, lin))
+
+def eh_parcela_minada_blocos(m, c):
+    """ (Baixo Nível) Verifica se a Parcela na posição c de um Campo por blocos está minada """
+    if not _eh_posicao(c): raise ValueError('eh_parcela_minada_blocos: argumentos invalidos')
+    return bool(_valor_blocos(m, c) & _MINA)
+
+def eh_parcela_limpa_blocos(m, c):
+    """ (Baixo Nível) Verifica se a Parcela na posição c de um Campo por blocos está limpa """
+    if not _eh_posicao(c): raise ValueError('eh_parcela_limpa_blocos: argumentos invalidos')
+    return bool(_valor_blocos(m, c) & _LIMPA)
+
+def eh_parcela_marcada_blocos(m, c):
+    """ (Baixo Nível) Verifica se a Parcela na posição c de um Campo por blocos está marcada """
+    if not _eh_posicao(c): raise ValueError('eh_parcela_marcada_blocos: argumentos invalidos')
+    return bool(_valor_blocos(m, c) & _MARCADA)
+
+def alterna_bandeira_blocos(m, c):
     """
-    limpa_parcela(obtem_parcela(m,c))                                                   # Limpa a Coordenada pretendida
-    if eh_coordenada_do_campo(m, c) and eh_parcela_minada(obtem_parcela(m,c)): return m # Não efetua limpeza da vizinhanca caso a parcela seja minada
-    if eh_coordenada_do_campo(m,c) and obtem_numero_minas_vizinhas(m, c) == 0:          # Procura limpar todas as conectadas à Coordenada inicial
-        for v in obtem_coordenadas_vizinhas(c):                                         # Este processo é feito recursivamente, vizinhança a vizinhança
-            if eh_coordenada_do_campo(m, v): 
-                p = obtem_parcela(m, v)
-                if not eh_parcela_minada(p) and eh_parcela_tapada(p):
-                    m = limpa_campo(m,v)
+    (Alto Nível)
+    Marca ou desmarca a Parcela tapada na posição c de um Campo por
+    blocos. Devolve True se a Parcela foi alterada
+
+    m (dict)      -- Campo por blocos
+    c (tuple)     -- Posição
+    return (bool) -- Se a Parcela foi alterada
+    """
+    if not _eh_posicao(c): raise ValueError('alterna_bandeira_blocos: argumentos invalidos')
+    v = _valor_blocos(m, c)
+    if v & _LIMPA: return False
+    _define_valor_blocos(m, c, v ^ _MARCADA)
+    return True
+
+def minas_vizinhas_blocos(m, c):
+    """ (Baixo Nível) Número de minas vizinhas da posição c de um Campo por blocos """
+    if not _eh_posicao(c): raise ValueError('minas_vizinhas_blocos: argumentos invalidos')
+    return sum(_valor_blocos(m, v) & _MINA for v in _vizinhas_blocos(c))
+
+def _limpa_campo_blocos(m, c):
+    """
+    limpa_campo sobre um Campo por blocos: a limpeza da vizinhança é feita
+    em largura, como em _limpa_vizinhanca, atravessando os blocos, e pára
+    ao fim de _MAXIMO_LIMPEZA Parcelas, já que o Campo não tem limites
+    """
+    if not _eh_posicao(c): raise ValueError('limpa_campo: argumentos invalidos')
+    v = _valor_blocos(m, c)
+    _define_valor_blocos(m, c, v & _MINA | _LIMPA)
+    if v & _MINA: return m
+    fila, visitadas, limpas = deque((c,)), {c}, 1
+    while fila:
+        viz = _vizinhas_blocos(fila.popleft())
+        if any(_valor_blocos(m, v) & _MINA for v in viz): continue     # Apenas as Parcelas sem minas vizinhas propagam a limpeza
+        for v in viz:
+            if v in visitadas: continue
+            visitadas.add(v)
+            if _valor_blocos(m, v): continue                            # Apenas as tapadas, sem mina nem bandeira, são limpas
+            _define_valor_blocos(m, v, _LIMPA)
+            fila.append(v)
+            limpas += 1
+            if limpas >= _MAXIMO_LIMPEZA: return m
     return m
 
+def campo_blocos_para_str(m, c1, c2):
+    """
+    (Baixo Nível)
+    Representação da zona retangular de um Campo por blocos entre as
+    posições c1 (canto superior esquerdo) e c2 (canto inferior direito),
+    uma linha de texto por linha do Campo, como em campo_para_str
+
+    m (dict)     -- Campo por blocos
+    c1 (tuple)   -- Canto superior esquerdo
+    c2 (tuple)   -- Canto inferior direito
+    return (str) -- Representação da zona
+    """
+    if not _eh_posicao(c1) or not _eh_posicao(c2): raise ValueError('campo_blocos_para_str: argumentos invalidos')
+    linhas = []
+    for lin in range(c1[1], c2[1] + 1):
+        linha = []
+        for col in range(c1[0], c2[0] + 1):
+            v = _valor_blocos(m, (col, lin))
+            linha.append(_DESENHO_LIMPA[minas_vizinhas_blocos(m, (col, lin))] if v & (_LIMPA | _MINA) == _LIMPA else _ESTADOS_CELULA[v])
+        linhas.append(''.join(linha))
+    return '\n'.join(linhas)
+
+def conta_blocos(m):
+    """ (Baixo Nível) Número de blocos em memória de um Campo por blocos: (alterados, não alterados) """
+    return len(m['alterados']), len(m['blocos'])
+
+####################
+### Persistência ###
+####################
+
+### Formato binário (versão 1), com inteiros little-endian:
+###   Campo   -- b'CMP', versão, colunas, linhas (1 byte cada), seguidos das
+###              células pela ordem do Campo compacto, 3 bits por célula (bit
+###              de mina e 2 bits de estado exterior), 8 células em cada 3 bytes
+###   Gerador -- b'GER', versão, bits (1 byte cada), seguidos do estado em
+###              bits // 8 + 1 bytes (o estado pode valer 2 ** bits)
+###   Arquivo -- b'ARQC', versão, 3 bytes a 0, os Campos em sequência, o índice
+###              com a posição de cada Campo (8 bytes cada), o número de Campos
+###              e a posição do índice (8 bytes cada)
+###   Registo -- Uma sequência de jogos, cada um com b'JOG', versão, colunas,
+###              linhas, dimensão do Gerador (1 byte cada), e o número de minas,
+###              a seed e o intervalo K entre pontos de retoma (varints),
+###              seguidos dos registos do jogo, cada um começando por um varint
+###              v em que v & 3 indica o tipo e v >> 2 o valor:
+###                0, 1 -- Jogada [L]impar ou [M]arcar, na Parcela de índice
+###                        v >> 2 (pela ordem das células de um Campo compacto)
+###                2    -- Ponto de retoma, com o Campo após K jogadas, em
+###                        v >> 2 bytes de campo_para_bytes
+###                3    -- Fim do jogo: v >> 2 é 0 se perdido, 1 se ganho e
+###                        2 se interrompido
+_VERSAO_BINARIA = 1
+
+def campo_para_bytes(m):
+    """
+    (Baixo Nível)
+    Devolve a representação binária compacta do Campo m, incluindo as
+    minas escondidas, que bytes_para_campo converte de volta num Campo
+
+    m (TAD)        -- Campo de Minas
+    return (bytes) -- Representação binária
+    """
+    if not eh_campo(m): raise ValueError('campo_para_bytes: argumentos invalidos')
+    colunas, linhas = ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m)
+    if _eh_campo_compacto(m): celulas = m['celulas']
+    else:
+        celulas = bytearray()
+        for col in range(65, 65 + colunas):
+            for lin in range(1, linhas + 1):
+                p = obtem_parcela(m, cria_coordenada(chr(col), lin))
+                celulas.append(eh_parcela_minada(p) * _MINA | eh_parcela_limpa(p) * _LIMPA | eh_parcela_marcada(p) * _MARCADA)
+    dados = bytearray(pack('<3sBBB', b'CMP', _VERSAO_BINARIA, colunas, linhas))
+    for i in range(0, len(celulas), 8):
+        v = 0
+        for k, c in enumerate(celulas[i:i+8]): v |= c << 3 * k
+        dados += v.to_bytes(3, 'little')
+    return bytes(dados)
+
+def _tamanho_campo_bytes(colunas, linhas): return 6 + 3 * ((colunas * linhas + 7) // 8)
+
+def bytes_para_campo(b):
+    """
+    (Baixo Nível)
+    Devolve o Campo (compacto) cuja representação binária é b
+
+    b (bytes)    -- Representação binária, de campo_para_bytes
+    return (TAD) -- Campo de Minas
+    """
+    try:
+        magia, versao, colunas, linhas = unpack_from('<3sBBB', b)
+        if magia != b'CMP' or versao != _VERSAO_BINARIA or len(b) != _tamanho_campo_bytes(colunas, linhas): raise ValueError
+        m = cria_campo_compacto(chr(64 + colunas), linhas)
+    except: raise ValueError('bytes_para_campo: argumentos invalidos')
+    celulas = m['celulas']
+    for i in range(0, len(celulas), 8):
+        v = int.from_bytes(b[6 + 3 * i // 8: 9 + 3 * i // 8], 'little')
+        for k in range(i, min(i + 8, len(celulas))):
+            celulas[k] = v & 7
+            v >>= 3
+    if max(celulas) >= len(_ESTADOS_CELULA): raise ValueError('bytes_para_campo: argumentos invalidos')
+    return _recalcula_campo_compacto(m)
+
+def gerador_para_bytes(g):
+    """
+    (Baixo Nível)
+    Devolve a representação binária do Gerador g
+
+    g (TAD)        -- Gerador
+    return (bytes) -- Representação binária
+    """
+    if not eh_gerador(g): raise ValueError('gerador_para_bytes: argumentos invalidos')
+    return pack('<3sBB', b'GER', _VERSAO_BINARIA, g[0]) + obtem_estado(g).to_bytes(g[0] // 8 + 1, 'little')
+
+def bytes_para_gerador(b):
+    """
+    (Baixo Nível)
+    Devolve o Gerador cuja representação binária é b
+
+    b (bytes)    -- Representação binária, de gerador_para_bytes
+    return (TAD) -- Gerador
+    """
+    try:
+        magia, versao, bits = unpack_from('<3sBB', b)
+        if magia != b'GER' or versao != _VERSAO_BINARIA or len(b) != 5 + bits // 8 + 1: raise ValueError
+        return cria_gerador(bits, int.from_bytes(b[5:], 'little'))
+    except: raise ValueError('bytes_para_gerador: argumentos invalidos')
+
+def escreve_arquivo_campos(caminho, campos):
+    """
+    Acrescenta os Campos ao arquivo no ficheiro 'caminho', criando-o caso
+    não exista. Apenas o índice no fim do ficheiro é reescrito.
+
+    caminho (str)  -- Ficheiro do arquivo
+    campos (iter)  -- Campos de Minas a acrescentar
+    return (int)   -- Número total de Campos no arquivo
+    """
+    existe = os.path.exists(caminho) and os.path.getsize(caminho) > 0
+    with open(caminho, 'r+b' if existe else 'w+b') as f:
+        if existe:
+            f.seek(-16, os.SEEK_END)
+            n, inicio = unpack('<QQ', f.read(16))
+            f.seek(inicio)
+            posicoes = list(unpack('<%dQ' % n, f.read(8 * n)))
+            f.seek(inicio)
+            f.truncate()
+        else:
+            f.write(pack('<4sB3x', b'ARQC', _VERSAO_BINARIA))
+            posicoes = []
+        for m in campos:
+            posicoes.append(f.tell())
+            f.write(campo_para_bytes(m))
+        inicio = f.tell()
+        f.write(pack('<%dQ' % len(posicoes), *posicoes))
+        f.write(pack('<QQ', len(posicoes), inicio))
+    return len(posicoes)
+
+def abre_arquivo_campos(caminho):
+    """
+    Abre um arquivo de Campos, mapeando o ficheiro em memória. Nenhum
+    Campo é lido até ser pedido a le_campo_arquivo
+
+    caminho (str)  -- Ficheiro do arquivo
+    return (dict)  -- Arquivo aberto
+    """
+    f = open(caminho, 'rb')
+    try:
+        mapa = mmap(f.fileno(), 0, access=ACCESS_READ)
+        magia, versao = unpack_from('<4sB', mapa)
+        n, inicio = unpack_from('<QQ', mapa, len(mapa) - 16)
+        if magia != b'ARQC' or versao != _VERSAO_BINARIA: raise ValueError
+    except:
+        f.close()
+        raise ValueError('abre_arquivo_campos: arquivo invalido')
+    return {'ficheiro': f, 'mapa': mapa, 'campos': n, 'indice': inicio}
+
+def numero_campos_arquivo(arq): return arq['campos']
+
+def le_campo_arquivo(arq, i):
+    """
+    Lê apenas o i-ésimo Campo (a partir de 0) de um arquivo aberto
+
+    arq (dict)   -- Arquivo aberto
+    i (int)      -- Posição do Campo no arquivo
+    return (TAD) -- Campo de Minas
+    """
+    if not isinstance(i, int) or not 0 <= i < arq['campos']: raise IndexError('le_campo_arquivo: posicao invalida')
+    mapa = arq['mapa']
+    inicio, = unpack_from('<Q', mapa, arq['indice'] + 8 * i)
+    colunas, linhas = unpack_from('<BB', mapa, inicio + 4)
+    return bytes_para_campo(mapa[inicio:inicio + _tamanho_campo_bytes(colunas, linhas)])
+
+def fecha_arquivo_campos(arq):
+    """ Fecha um arquivo aberto por abre_arquivo_campos """
+    arq['mapa'].close()
+    arq['ficheiro'].close()
+
+### Registo de jogadas: como o Gerador e a primeira jogada determinam a
+### colocação das minas, um jogo é reproduzível a partir de (c, l, n, d, s) e
+### das jogadas. O registo é apenas acrescentado, e pode ser repetido sem
+### validações nem desenho do Campo.
+_ACOES_REGISTO = ('L', 'M')
+_RESULTADOS_REGISTO = (False, True, None)
+
+def _escreve_varint(buf, v):
+    """ Acrescenta ao bytearray buf o inteiro não negativo v, 7 bits por byte """
+    while v > 0x7F:
+        buf.append(v & 0x7F | 0x80)
+        v >>= 7
+    buf.append(v)
+
+def _le_varint(b, i):
+    """ Lê o varint na posição i de b, devolvendo o valor e a posição seguinte """
+    v, k = 0, 0
+    while True:
+        byte = b[i]
+        v |= (byte & 0x7F) << k
+        i += 1
+        if byte < 0x80: return v, i
+        k += 7
+
+def cria_registo(f, c, l, n, d, s, k=64):
+    """
+    Começa o registo de um jogo, escrevendo o seu cabeçalho no ficheiro f,
+    aberto em modo binário. Os registos são acumulados em memória e escritos
+    a cada ponto de retoma e no fim do jogo
+
+    f (file)      -- Ficheiro (ou outro objeto com write) onde registar
+    c, l, n, d, s -- Argumentos do jogo, como em minas()
+    k (int)       -- Número de jogadas entre pontos de retoma
+    return (dict) -- Registo
+    """
+    if not isinstance(k, int) or k < 1 or not isinstance(n, int) or n < 0 or not isinstance(s, int) or s < 0:
+        raise ValueError('cria_registo: argumentos invalidos')
+    buf = bytearray(pack('<3sBBBB', b'JOG', _VERSAO_BINARIA, ord(c) - 64, l, d))
+    for v in (n, s, k): _escreve_varint(buf, v)
+    return {'ficheiro': f, 'buffer': buf, 'linhas': l, 'intervalo': k, 'jogadas': 0}
+
+def regista_jogada(r, m, move, target):
+    """
+    Acrescenta ao registo a jogada já aplicada ao Campo m, e um ponto de
+    retoma se for a K-ésima desde o anterior
+
+    r (dict)     -- Registo
+    m (TAD)      -- Campo de Minas, após a jogada
+    move (str)   -- Ação, 'L' ou 'M'
+    target (TAD) -- Coordenada
+    """
+    buf = r['buffer']
+    _escreve_varint(buf, ((ord(obtem_coluna(target)) - 65) * r['linhas'] + obtem_linha(target) - 1) << 2 | _ACOES_REGISTO.index(move))
+    r['jogadas'] += 1
+    if r['jogadas'] % r['intervalo'] == 0:
+        b = campo_para_bytes(m)
+        _escreve_varint(buf, len(b) << 2 | 2)
+        buf += b
+        r['ficheiro'].write(buf)
+        buf.clear()
+
+def termina_registo(r, resultado):
+    """ Termina o registo de um jogo com o seu resultado (True, False ou None) e escreve-o """
+    _escreve_varint(r['buffer'], _RESULTADOS_REGISTO.index(resultado) << 2 | 3)
+    r['ficheiro'].write(r['buffer'])
+    r['buffer'].clear()
+
+def _le_cabecalho_registo(b, i):
+    """ Lê o cabeçalho do jogo na posição i de b, devolvendo ((c, l, n, d, s), k, posição dos registos) """
+    try:
+        magia, versao, colunas, linhas, d = unpack_from('<3sBBBB', b, i)
+        if magia != b'JOG' or versao != _VERSAO_BINARIA: raise ValueError
+        i += 7
+        n, i = _le_varint(b, i)
+        s, i = _le_varint(b, i)
+        k, i = _le_varint(b, i)
+    except: raise ValueError('registo invalido')
+    return (chr(64 + colunas), linhas, n, d, s), k, i
+
+def repete_jogadas(b, inicio=0, turno=0):
+    """
+    Gerador que repete o jogo registado na posição 'inicio' de b (bytes,
+    bytearray ou mmap), sem validações nem desenho. Se turno > 0, começa
+    no último ponto de retoma antes desse turno, sem repetir as jogadas
+    anteriores. Produz, por cada jogada repetida, um tuplo (turno, ação,
+    Coordenada, resultado, Campo), com o Campo após a jogada; no fim,
+    devolve (como valor de StopIteration) o resultado registado e a
+    posição seguinte ao jogo em b.
+
+    b (bytes)     -- Registo
+    inicio (int)  -- Posição do jogo em b
+    turno (int)   -- Turno (a partir de 0) a partir do qual repetir
+    """
+    (c, l, n, d, s), k, i = _le_cabecalho_registo(b, inicio)
+    g, m, t = cria_gerador(d, s), cria_campo_compacto(c, l), 0
+    retoma = turno // k * k     # Jogadas incluídas no ponto de retoma de onde se parte
+    while True:
+        anterior = define_modo_confianca(True)  # Apenas durante cada registo: entre yields corre o código de quem chama
+        try:
+            v, i = _le_varint(b, i)
+            tipo, v = v & 3, v >> 2
+            if tipo == 3: return _RESULTADOS_REGISTO[v], i
+            if tipo == 2:
+                if t == retoma: m = bytes_para_campo(b[i:i + v])
+                i += v
+                continue
+            t += 1
+            if t <= retoma: continue    # Jogada já incluída no ponto de retoma
+            target, move = cria_coordenada(chr(65 + v // l), v % l + 1), _ACOES_REGISTO[tipo]
+            if t == 1:                                                  # A primeira jogada define a zona sem minas
+                coloca_minas(m, target, g, n)
+                limpa_campo(m, target)
+                resultado = True
+            else: resultado = aplica_jogada(m, move, target)
+        finally: define_modo_confianca(anterior)
+        if t > turno: yield t - 1, move, target, resultado, m
+
+def repete_registo(b, verifica=False):
+    """
+    Gerador que repete todos os jogos de um registo, produzindo por cada um
+    um dicionário com os argumentos do jogo, o resultado registado e o
+    obtido ao repeti-lo, o número de turnos e o Campo final. Se verifica,
+    compara ainda o Campo em cada ponto de retoma, indicando em
+    'divergencia' o primeiro turno em que difere (ou None).
+
+    b (bytes)       -- Registo
+    verifica (bool) -- Se os pontos de retoma são comparados
+    """
+    i = 0
+    while i < len(b):
+        jogo, k, _ = _le_cabecalho_registo(b, i)
+        jogadas = repete_jogadas(b, i)
+        info = {'jogo': jogo, 'resultado': None, 'registado': None, 'turnos': 0, 'campo': None, 'divergencia': None}
+        pontos = _pontos_retoma(b, i) if verifica else None
+        while True:
+            try: t, move, target, resultado, m = next(jogadas)
+            except StopIteration as fim:
+                info['registado'], i = fim.value
+                break
+            info['turnos'], info['campo'] = t + 1, m
+            if not resultado: info['resultado'] = False
+            elif jogo_ganho(m): info['resultado'] = True
+            else: info['resultado'] = None
+            if pontos and (t + 1) % k == 0 and info['divergencia'] is None and campo_para_bytes(m) != pontos.get(t + 1):
+                info['divergencia'] = t
+        yield info
+
+def _pontos_retoma(b, i):
+    """ Pontos de retoma do jogo na posição i de b, por número de jogadas """
+    _, k, i = _le_cabecalho_registo(b, i)
+    pontos, t = dict(), 0
+    while True:
+        v, i = _le_varint(b, i)
+        tipo, v = v & 3, v >> 2
+        if tipo == 3: return pontos
+        if tipo == 2:
+            pontos[t] = bytes(b[i:i + v])
+            i += v
+        else: t += 1
+
 ##################
 ### Auxiliares ###
 ##################
@@ -544,7 +1753,7 @@ def jogo_ganho(m):
     m (TAD)       -- Campo de Minas
     return (Bool) -- Estado do jogo
     """
-    if len(obtem_coordenadas(m, 'limpas')) + len(obtem_coordenadas(m, 'minadas'))\
+    if conta_coordenadas(m, 'limpas') + conta_coordenadas(m, 'minadas')\
         == (ord(obtem_ultima_coluna(m)) - 64) * obtem_ultima_linha(m):  # Considera-se limpo o campo que contiver apenas parcelas absolutamente limpas
             return True                                                 # e parcelas tapadas/marcadas minadas
     return False
@@ -571,6 +1780,19 @@ def turno_jogador(m):
     while not eh_coordenada(target) or not eh_coordenada_do_campo(m, target): 
         target = aux_coord_input()  # A execução procede apenas após se obter uma coordenada válida
 
+    return aplica_jogada(m, move, target)
+
+def aplica_jogada(m, move, target):
+    """
+    Aplica a ação 'move' ([L]impar ou [M]arcar) à Parcela do Campo m na
+    Coordenada target. Retorna False caso a ação ative uma mina, e True
+    caso contrário.
+
+    m (TAD)       -- Campo de Minas
+    move (str)    -- Ação, 'L' ou 'M'
+    target (TAD)  -- Coordenada
+    return (Bool) -- Resultado da ação
+    """
     p = obtem_parcela(m, target)
 
     if move == 'M': alterna_bandeira(p)
@@ -581,44 +1803,888 @@ def turno_jogador(m):
         limpa_campo(m, target)
     return True
 
-def minas(c, l, n, d, s):
+def minas(c, l, n, d, s, modo='gerador'):
     """
     Função principal do jogo das minas. Recebe todos os dados necessários
     para gerar um Campo e distribuir minas de forma pseudoaleatória
 
-    c (str)  -- Ultima coluna
-    l (int)  -- Ultima linha
-    n (int)  -- Número de minas
-    d (int)  -- Dimensão do gerador (32/64 bits)
-    s (seed) -- Seed para a geração da posição de minas
+    c (str)    -- Ultima coluna
+    l (int)    -- Ultima linha
+    n (int)    -- Número de minas
+    d (int)    -- Dimensão do gerador (32/64 bits)
+    s (seed)   -- Seed para a geração da posição de minas
+    modo (str) -- Modo de colocação das minas (ver coloca_minas)
     """
     try:
         g = cria_gerador(d, s)
-        m = cria_campo(c, l)                 # \/ Devem existir menos minas que casas no campo, contando com as 9 limpas inicialmente
-        if not isinstance(n, int) or n < 1 or n > (ord(c) - 64)*l - 9: raise ValueError 
+        m = cria_campo_compacto(c, l)        # \/ Devem existir menos minas que casas no campo, contando com as 9 limpas inicialmente
+        if not isinstance(n, int) or n < 1 or n > (ord(c) - 64)*l - 9 or modo not in _MODOS_COLOCACAO: raise ValueError 
     except: raise ValueError('minas: argumentos invalidos')
     
     state = 1   # gamestate, 1 enquanto jogavél, 0 se terminado
     def game_display():
-        print('   [Bandeiras '+str(len(obtem_coordenadas(m, 'marcadas')))+'/'+str(n)+']') # Contador de Bandeiras
+        print('   [Bandeiras '+str(conta_coordenadas(m, 'marcadas'))+'/'+str(n)+']') # Contador de Bandeiras
         print(campo_para_str(m))
     
-    game_display()                                  
-    target = aux_coord_input()                      # Numa primeira instância, exige-se uma coordenada e não uma ação
-    while not eh_coordenada_do_campo(m, target):    # uma vez que neste instante ainda não foram colocadas as minas
-        target = aux_coord_input()
-    coloca_minas(m,target, g, n)                    # Após conhecer a àrea na qual não devem existir as minas, estas são colocadas
-    limpa_campo(m, target)
-
-    while state == 1:
-        game_display()
-        if not turno_jogador(m):    # Condição de perda
-            state = 0
-            game_display()
-            print('BOOOOOOOM!!!')
-            return False
-        if jogo_ganho(m):           # Condição de vitória
-            state = 0
+    anterior = define_modo_confianca(True)  # Os argumentos já foram validados e o jogo só usa objetos criados pelo módulo
+    try:
+        game_display()                                  
+        target = aux_coord_input()                      # Numa primeira instância, exige-se uma coordenada e não uma ação
+        while not eh_coordenada_do_campo(m, target):    # uma vez que neste instante ainda não foram colocadas as minas
+            target = aux_coord_input()
+        coloca_minas(m,target, g, n, modo)              # Após conhecer a àrea na qual não devem existir as minas, estas são colocadas
+        limpa_campo(m, target)
+
+        while state == 1:
             game_display()
-            print('VITORIA!!!')
-            return True
+            if not turno_jogador(m):    # Condição de perda
+                state = 0
+                game_display()
+                print('BOOOOOOOM!!!')
+                return False
+            if jogo_ganho(m):           # Condição de vitória
+                state = 0
+                game_display()
+                print('VITORIA!!!')
+                return True
+    finally: define_modo_confianca(anterior)
+
+##################
+### Simulação  ###
+##################
+
+def simula_jogo(c, l, n, d, s, jogador, registo=None, intervalo=64):
+    """
+    Versão não interativa de minas(), sem input() nem representação do
+    Campo. As jogadas são pedidas ao jogador, que pode ser uma função,
+    chamada com o Campo em cada turno, ou um iterável de jogadas. Cada
+    jogada é um par (ação, Coordenada), com ação 'L' ou 'M'; na primeira
+    jogada a ação é ignorada, tal como em minas(). O jogo termina quando
+    é ganho, perdido, ou quando o jogador devolve None ou não tem mais
+    jogadas.
+
+    Devolve um dicionário com o resultado (True se ganho, False se
+    perdido, None se interrompido), o número de turnos, o número de
+    Parcelas limpas pela primeira jogada e no final do jogo, o Campo
+    final e o tempo gasto em cada fase: colocação das minas, decisão do
+    jogador e aplicação das jogadas. Se for dado um ficheiro 'registo',
+    as jogadas são registadas nele (ver cria_registo), com um ponto de
+    retoma a cada 'intervalo' jogadas.
+
+    c (str)              -- Ultima coluna
+    l (int)              -- Ultima linha
+    n (int)              -- Número de minas
+    d (int)              -- Dimensão do gerador (32/64 bits)
+    s (seed)             -- Seed para a geração da posição de minas
+    jogador (function)   -- Jogador, ou iterável de jogadas
+    registo (file)       -- Ficheiro binário onde registar o jogo
+    intervalo (int)      -- Jogadas entre pontos de retoma do registo
+    return (dict)        -- Resultado e estatísticas do jogo
+    """
+    try:
+        g = cria_gerador(d, s)
+        m = cria_campo_compacto(c, l)
+        if not isinstance(n, int) or n < 1 or n > (ord(c) - 64)*l - 9: raise ValueError 
+        r = None if registo is None else cria_registo(registo, c, l, n, d, s, intervalo)
+    except: raise ValueError('simula_jogo: argumentos invalidos')
+    if callable(jogador): proxima = lambda: jogador(m)
+    else:
+        jogadas = iter(jogador)
+        proxima = lambda: next(jogadas, None)
+
+    tempos = {'colocacao': 0.0, 'jogador': 0.0, 'jogadas': 0.0}
+    stats = {'resultado': None, 'turnos': 0, 'abertura': 0, 'limpas': 0, 'campo': m, 'tempos': tempos}
+    anterior = define_modo_confianca(True)
+    try:
+        while True:
+            inicio = perf_counter()
+            jogada = proxima()
+            tempos['jogador'] += perf_counter() - inicio
+            if jogada is None: break
+            move, target = jogada
+            if (move not in ['L', 'M'] and stats['turnos'] > 0) or not eh_coordenada_do_campo(m, target):
+                raise ValueError('simula_jogo: jogada invalida')
+
+            inicio = perf_counter()
+            if stats['turnos'] == 0:            # A primeira jogada define a zona sem minas
+                coloca_minas(m, target, g, n)
+                tempos['colocacao'] += perf_counter() - inicio
+                inicio = perf_counter()
+                limpa_campo(m, target)
+                stats['abertura'] = conta_coordenadas(m, 'limpas')
+                resultado = True
+            else: resultado = aplica_jogada(m, move, target)
+            stats['turnos'] += 1
+            ganho = resultado and jogo_ganho(m)
+            tempos['jogadas'] += perf_counter() - inicio
+            if r is not None: regista_jogada(r, m, 'L' if stats['turnos'] == 1 else move, target)
+
+            if not resultado:                   # Condição de perda
+                stats['resultado'] = False
+                break
+            if ganho:                           # Condição de vitória
+                stats['resultado'] = True
+                break
+    finally:
+        define_modo_confianca(anterior)
+        if r is not None: termina_registo(r, stats['resultado'])    # Um jogo interrompido por erro fica registado como interrompido
+    stats['limpas'] = conta_coordenadas(m, 'limpas')
+    return stats
+
+def analisa_semente(config, s, jogador=None):
+    """
+    Joga, sem interação, o jogo definido pela configuração e pela seed s,
+    começando sempre pela primeira Coordenada da configuração. O resultado
+    depende apenas dos argumentos, pelo que pode ser calculado em qualquer
+    processo. Sem jogador, o jogo termina após a primeira jogada.
+
+    config (tuple)     -- (c, l, n, d, primeira Coordenada), como em simula_jogo
+    s (int)            -- Seed
+    jogador (function) -- Função sem argumentos que cria um jogador novo para simula_jogo
+    return (dict)      -- Configuração, seed, resultado, turnos, abertura, limpas e densidades locais
+    """
+    c, l, n, d, primeiro = config
+    restantes = jogador() if jogador is not None else lambda m: None
+    inicio = [('L', primeiro)]
+    stats = simula_jogo(c, l, n, d, s, lambda m: inicio.pop() if inicio else restantes(m))
+    m, derrota = stats['campo'], None
+    if stats['resultado'] is False:
+        derrota = next(x for x in obtem_coordenadas(m, 'limpas') if eh_parcela_minada(obtem_parcela(m, x)))
+    return {'config': config, 'semente': s, 'resultado': stats['resultado'], 'turnos': stats['turnos'],
+            'abertura': stats['abertura'], 'limpas': stats['limpas'],
+            'densidade_abertura': _densidade_local(m, primeiro, 2),
+            'densidade_derrota': None if derrota is None else _densidade_local(m, derrota, 1)}
+
+def _densidade_local(m, c, raio):
+    """
+    Fração de Parcelas minadas entre as Parcelas do Campo a distância 'raio'
+    (em linhas ou colunas) da Coordenada c. Com raio 2 à volta da primeira
+    jogada é o anel logo a seguir à zona sem minas; com raio 1 à volta da
+    Parcela que fez perder o jogo são as suas vizinhas.
+    """
+    colunas, linhas = ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m)
+    col, lin = ord(obtem_coluna(c)) - 64, obtem_linha(c)
+    total = minadas = 0
+    for x in range(max(1, col - raio), min(colunas, col + raio) + 1):
+        for y in range(max(1, lin - raio), min(linhas, lin + raio) + 1):
+            if max(abs(x - col), abs(y - lin)) != raio: continue
+            total += 1
+            minadas += eh_parcela_minada(obtem_parcela(m, cria_coordenada(chr(x + 64), y)))
+    return minadas / total if total else 0.0
+
+def _analisa_bloco(config, sementes, jogador):
+    """ Tarefa de cada processo em varre_sementes: analisa um bloco de seeds """
+    return [analisa_semente(config, s, jogador) for s in sementes]
+
+def _blocos(configs, sementes, bloco):
+    """ Divide o produto das configurações pelas seeds em blocos de, no máximo, 'bloco' seeds """
+    for config in configs:
+        restantes = iter(sementes)
+        atual = list(islice(restantes, bloco))
+        while atual:
+            yield config, atual
+            atual = list(islice(restantes, bloco))
+
+def varre_sementes(configs, sementes, jogador=None, processos=None, bloco=1000, ordenado=True):
+    """
+    Analisa (analisa_semente) todas as seeds de 'sementes' para cada uma das
+    configurações, distribuindo blocos de seeds por um conjunto de processos.
+    Os resultados são devolvidos bloco a bloco, à medida que ficam prontos,
+    como listas de resultados. Com ordenado=True os blocos são devolvidos
+    pela ordem das configurações e seeds; caso contrário, pela ordem em que
+    terminam. Existem no máximo 2 blocos por processo em espera, pelo que a
+    memória não depende do número de seeds.
+
+    configs (tuple)     -- Configurações (c, l, n, d, primeira Coordenada)
+    sementes (iter)     -- Seeds a analisar, ex. range(1, 10**7). Com mais de uma configuração, as
+                           seeds são percorridas uma vez por configuração, pelo que não podem ser
+                           um iterador (ex. um gerador), que só pode ser percorrido uma vez
+    jogador (function)  -- Ver analisa_semente; deve poder ser enviado a outro processo
+    processos (int)     -- Número de processos, por omissão o número de CPUs. Com 1 não é criado nenhum processo
+    bloco (int)         -- Seeds por tarefa
+    ordenado (bool)     -- Se os blocos devem ser devolvidos por ordem
+    return (generator)  -- Listas de resultados
+    """
+    configs = tuple(configs)
+    if not isinstance(bloco, int) or bloco < 1 or (len(configs) > 1 and iter(sementes) is sementes):
+        raise ValueError('varre_sementes: argumentos invalidos')
+    tarefas = _blocos(configs, sementes, bloco)
+    if processos == 1:
+        for config, seeds in tarefas: yield _analisa_bloco(config, seeds, jogador)
+        return
+    processos = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(processos) as executor:
+        pendentes = deque()
+        for config, seeds in tarefas:
+            pendentes.append(executor.submit(_analisa_bloco, config, seeds, jogador))
+            if len(pendentes) >= 2 * processos: yield from _recolhe(pendentes, ordenado)
+        while pendentes: yield from _recolhe(pendentes, ordenado)
+
+def _recolhe(pendentes, ordenado):
+    """ Espera pelo bloco mais antigo (ordenado) ou pelo primeiro a terminar, devolvendo os resultados prontos """
+    if ordenado:
+        yield pendentes.popleft().result()
+        return
+    feitas, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+    for f in feitas:
+        pendentes.remove(f)
+        yield f.result()
+
+def agrega_resultados(resultados, agregado=None):
+    """
+    Acumula resultados de analisa_semente em estatísticas por configuração:
+    número de jogos, vitórias e derrotas, taxa de vitória, tamanho médio,
+    mínimo e máximo da área limpa pela primeira jogada, densidade média de
+    minas no anel à volta da zona sem minas e densidade média de minas à
+    volta das Parcelas que fizeram perder (sobre as derrotas).
+    Pode ser chamada com cada bloco de varre_sementes, passando o agregado
+    anterior.
+
+    resultados (list) -- Resultados de analisa_semente
+    agregado (dict)   -- Estatísticas anteriores, a atualizar
+    return (dict)     -- Estatísticas por configuração
+    """
+    if agregado is None: agregado = dict()
+    for r in resultados:
+        a = agregado.setdefault(r['config'], {'jogos': 0, 'vitorias': 0, 'derrotas': 0, 'taxa_vitoria': 0.0,
+            'abertura_media': 0.0, 'abertura_min': r['abertura'], 'abertura_max': 0,
+            'densidade_abertura_media': 0.0, 'densidade_derrota_media': 0.0})
+        a['jogos'] += 1
+        a['vitorias'] += r['resultado'] is True
+        a['derrotas'] += r['resultado'] is False
+        a['taxa_vitoria'] = a['vitorias'] / a['jogos']
+        a['abertura_media'] += (r['abertura'] - a['abertura_media']) / a['jogos']
+        a['densidade_abertura_media'] += (r['densidade_abertura'] - a['densidade_abertura_media']) / a['jogos']
+        if r['densidade_derrota'] is not None:
+            a['densidade_derrota_media'] += (r['densidade_derrota'] - a['densidade_derrota_media']) / a['derrotas']
+        a['abertura_min'] = min(a['abertura_min'], r['abertura'])
+        a['abertura_max'] = max(a['abertura_max'], r['abertura'])
+    return agregado
+
+##################
+### Resolvedor ###
+##################
+
+### O Resolvedor deduz, a partir apenas da informação visível de um Campo, as
+### Parcelas tapadas que são certamente seguras ou certamente minadas. Cada
+### Parcela limpa com minas vizinhas dá uma restrição: entre as suas vizinhas
+### ainda desconhecidas existem exatamente k minas. O Resolvedor guarda estas
+### restrições entre chamadas e apenas acrescenta as das Parcelas limpas desde
+### a última atualização.
+
+def cria_resolvedor(m):
+    """
+    Cria um Resolvedor para o Campo m. O Resolvedor acompanha o Campo:
+    após cada jogada, resolve_campo considera as novas Parcelas limpas
+
+    Ex. Meramente Illustrativo
+
+        {'campo': m, 'vistas': {...}, 'restricoes': {('B', 2): [{('A', 1), ('C', 1)}, 1]},
+         'celulas': {('A', 1): {('B', 2)}, ('C', 1): {('B', 2)}}, 'minas': set(), 'seguras': set()}
+
+    m (TAD)       -- Campo de Minas
+    return (dict) -- Resolvedor
+    """
+    if not eh_campo(m): raise ValueError('cria_resolvedor: argumentos invalidos')
+    return {'campo': m, 'vistas': 0 if _eh_campo_compacto(m) else set(),
+            'restricoes': dict(), 'celulas': dict(), 'minas': set(), 'seguras': set()}
+
+def _novas_limpas(r):
+    """ Coordenadas limpas desde a última atualização do Resolvedor """
+    m = r['campo']
+    if _eh_campo_compacto(m):
+        novas, r['vistas'] = m['limpas'] & ~r['vistas'], m['limpas']
+        return _coordenadas_bits(m, novas)
+    novas = [c for c in obtem_coordenadas(m, 'limpas') if c not in r['vistas']]
+    r['vistas'].update(novas)
+    return novas
+
+def _vizinhas_do_campo(m, c):
+    """ Coordenadas vizinhas de c que pertencem ao Campo m """
+    return _vizinhas_campo(obtem_ultima_coluna(m), obtem_ultima_linha(m))[c]
+
+def _define_conhecida(r, c, mina, pendentes):
+    """ Regista que a Parcela em c é minada (ou segura), retirando-a das restrições que a incluem """
+    if c in r['minas'] or c in r['seguras']: return
+    r['minas' if mina else 'seguras'].add(c)
+    for rid in r['celulas'].pop(c, ()):
+        restricao = r['restricoes'][rid]
+        restricao[0].discard(c)
+        if mina: restricao[1] -= 1
+        if restricao[0]: pendentes.add(rid)
+        else: del r['restricoes'][rid]
+
+def _componentes(r, rids):
+    """
+    Agrupa as restrições rids em componentes independentes: duas restrições
+    pertencem à mesma componente se estiverem ligadas por Parcelas comuns
+    """
+    por_visitar, componentes = set(rids) & r['restricoes'].keys(), []
+    while por_visitar:
+        componente, fila = set(), [por_visitar.pop()]
+        while fila:
+            rid = fila.pop()
+            componente.add(rid)
+            for c in r['restricoes'][rid][0]:
+                for outra in r['celulas'][c]:
+                    if outra not in componente:
+                        componente.add(outra)
+                        por_visitar.discard(outra)
+                        fila.append(outra)
+        componentes.append(componente)
+    return componentes
+
+def _propaga(r, pendentes):
+    """
+    Aplica as regras de dedução às restrições pendentes de uma componente,
+    até não haver mais deduções:
+        - uma restrição com 0 minas torna seguras as suas Parcelas, e uma com
+          tantas minas como Parcelas torna-as todas minadas;
+        - para duas restrições A e B com Parcelas comuns, se as minas de A
+          menos as de B igualam as Parcelas só de A, essas Parcelas são
+          minadas e as Parcelas só de B são seguras (inclui o caso A ⊆ B).
+    """
+    restricoes = r['restricoes']
+    while pendentes:
+        rid = pendentes.pop()
+        if rid not in restricoes: continue
+        celulas, k = restricoes[rid]
+        if k == 0 or k == len(celulas):
+            for c in list(celulas): _define_conhecida(r, c, k > 0, pendentes)
+            continue
+        outras = {o for c in celulas for o in r['celulas'][c]} - {rid}
+        for oid in outras:
+            ocelulas, ok = restricoes[oid]
+            so_a, so_b = celulas - ocelulas, ocelulas - celulas
+            if k - ok == len(so_a) and (so_a or so_b):
+                minas, seguras = so_a, so_b
+            elif ok - k == len(so_b) and (so_a or so_b):
+                minas, seguras = so_b, so_a
+            else: continue
+            for c in list(minas): _define_conhecida(r, c, True, pendentes)
+            for c in list(seguras): _define_conhecida(r, c, False, pendentes)
+            pendentes.add(rid)
+            break
+
+def atualiza_resolvedor(r):
+    """
+    Acrescenta ao Resolvedor a informação das Parcelas limpas desde a
+    última atualização e propaga as deduções, componente a componente,
+    apenas a partir das restrições novas ou alteradas
+
+    r (dict)      -- Resolvedor
+    return (dict) -- Resolvedor
+    """
+    m, pendentes = r['campo'], set()
+    novas = _novas_limpas(r)
+    for c in novas:                             # Uma Parcela limpa deixa de ser desconhecida
+        if eh_parcela_minada(obtem_parcela(m, c)): _define_conhecida(r, c, True, pendentes)
+        else: _define_conhecida(r, c, False, pendentes)
+        r['seguras'].discard(c)
+    for c in novas:
+        if eh_parcela_minada(obtem_parcela(m, c)): continue
+        desconhecidas, k = set(), obtem_numero_minas_vizinhas(m, c)
+        for v in _vizinhas_do_campo(m, c):
+            if v in r['minas']: k -= 1
+            elif v not in r['seguras'] and not eh_parcela_limpa(obtem_parcela(m, v)): desconhecidas.add(v)
+        if not desconhecidas: continue
+        r['restricoes'][c] = [desconhecidas, k]
+        for v in desconhecidas: r['celulas'].setdefault(v, set()).add(c)
+        pendentes.add(c)
+    for componente in _componentes(r, pendentes): _propaga(r, componente)
+    return r
+
+def resolve_campo(r):
+    """
+    Atualiza o Resolvedor e devolve as Parcelas tapadas que são certamente
+    seguras e as que são certamente minadas, dada a informação visível do
+    Campo, cada grupo pela ordem de obtem_coordenadas
+
+    r (dict)       -- Resolvedor
+    return (tuple) -- (Coordenadas seguras, Coordenadas minadas)
+    """
+    atualiza_resolvedor(r)
+    m, ordem = r['campo'], lambda c: (obtem_linha(c), obtem_coluna(c))
+    seguras = [c for c in r['seguras'] if not eh_parcela_limpa(obtem_parcela(m, c))]
+    minas = [c for c in r['minas'] if not eh_parcela_limpa(obtem_parcela(m, c))]
+    return tuple(sorted(seguras, key=ordem)), tuple(sorted(minas, key=ordem))
+
+def jogador_resolvedor():
+    """
+    Cria um jogador para simula_jogo que limpa sempre uma Parcela segura
+    indicada pelo Resolvedor e, quando não existe nenhuma, a primeira
+    Parcela tapada que não se sabe ser minada. A primeira jogada é o
+    centro do Campo, a não ser que o jogo já tenha começado (ex. em
+    analisa_semente), caso em que o jogador continua a partir do Campo.
+
+    return (function) -- Jogador
+    """
+    estado = {'resolvedor': None}
+    def jogador(m):
+        r = estado['resolvedor']
+        if r is None:
+            r = estado['resolvedor'] = cria_resolvedor(m)
+            if not conta_coordenadas(m, 'limpas'): return ('L', cria_coordenada(chr((ord(obtem_ultima_coluna(m)) + 65) // 2), (obtem_ultima_linha(m) + 1) // 2))
+        seguras, minas = resolve_campo(r)
+        if seguras: return ('L', seguras[0])
+        for c in obtem_coordenadas(m, 'tapadas'):
+            if c not in r['minas']: return ('L', c)
+    return jogador
+
+_CACHE_COMPONENTES = OrderedDict()      # Distribuições de componentes já enumeradas, da mais antiga para a mais recente
+_MAX_CACHE_COMPONENTES = 4096
+
+def _distribuicao_componente(restricoes):
+    """
+    Conta todas as configurações de minas das Parcelas de uma componente
+    que satisfazem as suas restrições, dadas como pares (Parcelas, minas).
+    Devolve as Parcelas da componente e um dicionário que associa a cada
+    número total de minas t o número de configurações com t minas e, para
+    cada Parcela, em quantas delas está minada. As componentes já
+    contadas são guardadas, pelas suas restrições, em _CACHE_COMPONENTES.
+
+    As Parcelas são decididas uma a uma, ao longo da fronteira. Em vez de
+    percorrer cada configuração, agrupam-se as configurações parciais pelo
+    número de minas já atribuídas a cada restrição ainda em aberto (o
+    'estado'), contando em quantas se chega a cada estado a partir do
+    início e a partir do fim, o que torna o custo proporcional ao número
+    de estados e não ao número de configurações.
+    """
+    chave = tuple(sorted((tuple(sorted(cs)), k) for cs, k in restricoes))
+    if chave in _CACHE_COMPONENTES:
+        _CACHE_COMPONENTES.move_to_end(chave)
+        return _CACHE_COMPONENTES[chave]
+
+    por_celula = dict()
+    for j, (cs, k) in enumerate(chave):
+        for c in cs: por_celula.setdefault(c, []).append(j)
+    inicio = min(range(len(chave)), key=lambda j: len({o for c in chave[j][0] for o in por_celula[c]}))
+    celulas, indices, ordem, vistas = [], dict(), deque([inicio]), {inicio}
+    while ordem:                                # As restrições são percorridas em largura a partir de uma ponta da
+        for c in chave[ordem.popleft()][0]:     # fronteira, para que haja poucas restrições em aberto de cada vez
+            if c in indices: continue
+            indices[c] = len(celulas)
+            celulas.append(c)
+            for j in por_celula[c]:
+                if j not in vistas:
+                    vistas.add(j)
+                    ordem.append(j)
+
+    n = len(celulas)
+    posicoes = [sorted(indices[c] for c in cs) for cs, k in chave]
+    abertas = [[] for i in range(n + 1)]        # Restrições em aberto entre a Parcela i-1 e a Parcela i
+    for j, pos in enumerate(posicoes):
+        for i in range(pos[0] + 1, pos[-1] + 1): abertas[i].append(j)
+    faltam = [dict() for i in range(n)]         # Parcelas de cada restrição depois da Parcela i
+    for j, pos in enumerate(posicoes):
+        for x, i in enumerate(pos): faltam[i][j] = len(pos) - x - 1
+
+    transicoes = [dict() for i in range(n)]
+    def transicao(i, estado, v):
+        """ Estado após decidir a Parcela i (v = 1 se minada), ou None se alguma restrição deixar de ter solução """
+        if (estado, v) not in transicoes[i]:
+            atual, seguinte = dict(zip(abertas[i], estado)), None
+            for j, f in faltam[i].items():
+                atual[j] = atual.get(j, 0) + v
+                if atual[j] > chave[j][1] or atual[j] + f < chave[j][1]: break
+            else: seguinte = tuple(atual[j] for j in abertas[i + 1])
+            transicoes[i][(estado, v)] = seguinte
+        return transicoes[i][(estado, v)]
+
+    def soma(destino, origem, v):
+        for t, k in origem.items(): destino[t + v] = destino.get(t + v, 0) + k
+
+    frente = [{(): {0: 1}}]                     # frente[i][estado][t]: decididas as Parcelas antes de i, com t minas
+    for i in range(n):
+        proximo = dict()
+        for estado, minas in frente[i].items():
+            for v in (0, 1):
+                seguinte = transicao(i, estado, v)
+                if seguinte is not None: soma(proximo.setdefault(seguinte, dict()), minas, v)
+        frente.append(proximo)
+    tras = [None] * n + [{(): {0: 1}}]          # tras[i][estado][t]: por decidir as Parcelas a partir de i, com t minas
+    for i in range(n - 1, -1, -1):
+        tras[i] = dict()
+        for estado in frente[i]:
+            for v in (0, 1):
+                seguinte = transicao(i, estado, v)
+                if seguinte in tras[i + 1]: soma(tras[i].setdefault(estado, dict()), tras[i + 1][seguinte], v)
+
+    distribuicao = {t: [k, [0] * n] for t, k in frente[n].get((), dict()).items()}
+    for i in range(n):
+        for estado, minas in frente[i].items():
+            seguinte = transicao(i, estado, 1)
+            if seguinte not in tras[i + 1]: continue
+            for t, k in minas.items():
+                for r, kr in tras[i + 1][seguinte].items(): distribuicao[t + 1 + r][1][i] += k * kr
+
+    _CACHE_COMPONENTES[chave] = (celulas, distribuicao)
+    if len(_CACHE_COMPONENTES) > _MAX_CACHE_COMPONENTES: _CACHE_COMPONENTES.popitem(last=False)
+    return celulas, distribuicao
+
+def _convolucao(a, b):
+    """ Combina duas distribuições {minas: configurações} de Parcelas independentes """
+    c = dict()
+    for ta, na in a.items():
+        for tb, nb in b.items(): c[ta + tb] = c.get(ta + tb, 0) + na * nb
+    return c
+
+def probabilidades_minas(m, n, r=None):
+    """
+    Devolve a probabilidade exata de cada Parcela por limpar do Campo m
+    esconder uma mina, dada apenas a informação visível e o número total
+    de minas n, considerando igualmente prováveis todas as configurações
+    de minas compatíveis. As Parcelas marcadas são tratadas como tapadas.
+
+    As Parcelas deduzidas pelo Resolvedor têm probabilidade 0 ou 1. As
+    restantes Parcelas da fronteira são divididas em componentes
+    independentes, cujas configurações são enumeradas separadamente (e
+    memorizadas, pelo que componentes inalteradas não são enumeradas de
+    novo), e combinadas entre si e com as Parcelas interiores, que não
+    tocam em nenhuma Parcela limpa, pesando cada total de minas da
+    fronteira pelo coeficiente binomial das minas restantes no interior.
+
+    m (TAD)       -- Campo de Minas
+    n (int)       -- Número total de minas
+    r (dict)      -- Resolvedor de m, reutilizado entre chamadas (opcional)
+    return (dict) -- Probabilidade de cada Coordenada por limpar
+    """
+    if r is None: r = cria_resolvedor(m)
+    elif r['campo'] is not m: raise ValueError('probabilidades_minas: argumentos invalidos')
+    atualiza_resolvedor(r)
+    por_limpar = obtem_coordenadas(m, 'tapadas') + obtem_coordenadas(m, 'marcadas')
+    restantes = n - len(r['minas'])
+    componentes = [_distribuicao_componente([r['restricoes'][rid] for rid in comp])
+                   for comp in _componentes(r, r['restricoes'].keys())]
+    fronteira = {c for celulas, d in componentes for c in celulas}
+    interior = [c for c in por_limpar if c not in fronteira and c not in r['minas'] and c not in r['seguras']]
+    peso = lambda t: comb(len(interior), restantes - t) if 0 <= restantes - t <= len(interior) else 0
+
+    totais = [{t: e[0] for t, e in d.items()} for celulas, d in componentes]
+    total = {0: 1}
+    for t in totais: total = _convolucao(total, t)
+    z = sum(k * peso(t) for t, k in total.items())
+    if z == 0: raise ValueError('probabilidades_minas: campo inconsistente com ' + str(n) + ' minas')
+
+    prob = {c: 1.0 if c in r['minas'] else 0.0 for c in por_limpar if c in r['minas'] or c in r['seguras']}
+    for i, (celulas, d) in enumerate(componentes):
+        outras = {0: 1}
+        for j, t in enumerate(totais):
+            if j != i: outras = _convolucao(outras, t)
+        acumulado = [0] * len(celulas)
+        for t, (k, por_celula) in d.items():
+            w = sum(ko * peso(t + to) for to, ko in outras.items())
+            for x, v in enumerate(por_celula): acumulado[x] += v * w
+        for x, c in enumerate(celulas): prob[c] = acumulado[x] / z
+    if interior:
+        minas_interior = sum(k * peso(t) * (restantes - t) for t, k in total.items())
+        for c in interior: prob[c] = minas_interior / z / len(interior)
+    return prob
+
+#############################
+### Campos sem palpites   ###
+#############################
+
+### Um Campo sem palpites é um Campo que o Resolvedor resolve por completo a
+### partir da primeira jogada, sem nunca ter de arriscar. Para um Gerador com
+### estado s, experimentam-se Campos candidatos: o candidato k coloca as minas
+### como coloca_minas, com um Gerador cujo estado é s (k = 0) ou derivado de s
+### e de k. É aceite o primeiro candidato, por ordem de k, que o Resolvedor
+### resolve, pelo que o resultado não depende do número de processos usados.
+### Com muitas minas, pode não existir nenhum candidato resolvível: a procura
+### tem um limite de candidatos e, opcionalmente, de tempo. Os processos são
+### criados uma única vez e reutilizados pelas procuras seguintes.
+_CACHE_SEM_PALPITES = OrderedDict()     # (c, l, n, d, s, primeira) -> (k, minas, estado final), do mais antigo para o mais recente
+_MAX_CACHE_SEM_PALPITES = 1024
+_PROCESSOS_SEM_PALPITES = None          # Processos usados por coloca_minas no modo 'sem-palpites' (por omissão, o número de CPUs)
+_TENTATIVAS_SEM_PALPITES = 10000        # Candidatos, no máximo, em coloca_minas no modo 'sem-palpites'
+_TEMPO_SEM_PALPITES = 2.0               # Segundos, no máximo, em coloca_minas no modo 'sem-palpites'
+_CANDIDATOS_POR_TAREFA = 4
+_EXECUTOR_SEM_PALPITES = None           # (processos, ProcessPoolExecutor) partilhado pelas procuras
+
+def _gerador_candidato(d, s, k):
+    """ Gerador do candidato k para a seed s """
+    return cria_gerador(d, s if k == 0 else _mistura_semente(d, s ^ k * 0x9E3779B97F4A7C15))
+
+def _resolvivel(m, c):
+    """ Verifica se o Resolvedor resolve o Campo m, já minado, a partir da Coordenada c, sem palpites """
+    limpa_campo(m, c)
+    r = cria_resolvedor(m)
+    while not jogo_ganho(m):
+        seguras, minas = resolve_campo(r)
+        if not seguras: return False
+        for s in seguras: limpa_campo(m, s)
+    return True
+
+def _testa_candidatos(c, l, n, d, s, primeira, ks, limite=None):
+    """
+    Devolve (k, minas, estado final) do primeiro candidato de ks resolvível,
+    None se nenhum o é, ou False se o instante limite (de monotonic()) passou
+    antes de testar todos
+    """
+    anterior = define_modo_confianca(True)
+    try:
+        for k in ks:
+            if limite is not None and monotonic() > limite: return False
+            g, m = _gerador_candidato(d, s, k), cria_campo_compacto(c, l)
+            coloca_minas(m, primeira, g, n)
+            minas = obtem_coordenadas(m, 'minadas')
+            if _resolvivel(m, primeira): return k, minas, obtem_estado(g)
+    finally: define_modo_confianca(anterior)
+
+def gera_minas_sem_palpites(c, l, n, d, s, primeira, processos=None, tentativas=10000, tempo=None):
+    """
+    (Alto Nível)
+    Procura, entre os candidatos da seed s, o primeiro Campo c x l com n
+    minas que se resolve sem palpites a partir da Coordenada primeira.
+    Os candidatos são testados em blocos, distribuídos por um conjunto de
+    processos; assim que um é aceite, os blocos posteriores ainda não
+    iniciados são cancelados. Os resultados ficam guardados numa cache.
+
+    Devolve o número do candidato aceite, as Coordenadas minadas e o
+    estado do Gerador após a colocação. Se nenhum dos 'tentativas'
+    candidatos é aceite, ou se passam 'tempo' segundos sem que a procura
+    termine, levanta ValueError (coloca_minas recorre então ao modo
+    'gerador'). Com um limite de tempo, o resultado só depende dos
+    argumentos quando a procura termina a tempo.
+
+    c, l, n, d, s    -- Argumentos do jogo, como em minas()
+    primeira (TAD)   -- Coordenada da primeira jogada
+    processos (int)  -- Número de processos, por omissão o número de CPUs. Com 1 não é criado nenhum processo
+    tentativas (int) -- Número máximo de candidatos (o primeiro bloco é sempre testado sem processos)
+    tempo (float)    -- Segundos, no máximo, de procura (None para não limitar)
+    return (tuple)   -- (k, Coordenadas minadas, estado do Gerador)
+    """
+    try:
+        cria_gerador(d, s)
+        if not eh_coordenada_do_campo(cria_campo_compacto(c, l), primeira) or not isinstance(n, int)\
+            or n < 1 or n > (ord(c) - 64)*l - 9 or not isinstance(tentativas, int) or tentativas < 1\
+            or (tempo is not None and (not isinstance(tempo, (int, float)) or tempo <= 0)): raise ValueError
+    except: raise ValueError('gera_minas_sem_palpites: argumentos invalidos')
+    chave = (c, l, n, d, s, primeira)
+    if chave in _CACHE_SEM_PALPITES:
+        _CACHE_SEM_PALPITES.move_to_end(chave)
+        return _CACHE_SEM_PALPITES[chave]
+
+    limite = None if tempo is None else monotonic() + tempo     # monotonic é o mesmo relógio em todos os processos
+    blocos = (range(k, min(k + _CANDIDATOS_POR_TAREFA, tentativas)) for k in range(0, tentativas, _CANDIDATOS_POR_TAREFA))
+    processos = processos or os.cpu_count() or 1
+    resultado = _testa_candidatos(*chave, next(blocos), limite)    # Muitas vezes basta o primeiro bloco, sem o custo de criar processos
+    if resultado is None and processos == 1:
+        resultado = next((r for r in (_testa_candidatos(*chave, ks, limite) for ks in blocos) if r is not None), None)
+    elif resultado is None: resultado = _procura_paralela(chave, blocos, processos, limite)
+    if resultado is False: raise ValueError('gera_minas_sem_palpites: nenhum candidato em {} s'.format(tempo))
+    if resultado is None: raise ValueError('gera_minas_sem_palpites: nenhum candidato em ' + str(tentativas))
+
+    _CACHE_SEM_PALPITES[chave] = resultado
+    if len(_CACHE_SEM_PALPITES) > _MAX_CACHE_SEM_PALPITES: _CACHE_SEM_PALPITES.popitem(last=False)
+    return resultado
+
+def _executor_sem_palpites(processos):
+    """ Conjunto de processos partilhado pelas procuras, recriado apenas se o número de processos muda """
+    global _EXECUTOR_SEM_PALPITES
+    if _EXECUTOR_SEM_PALPITES is None or _EXECUTOR_SEM_PALPITES[0] != processos:
+        termina_processos_sem_palpites()
+        _EXECUTOR_SEM_PALPITES = (processos, ProcessPoolExecutor(processos))
+    return _EXECUTOR_SEM_PALPITES[1]
+
+@atexit.register
+def termina_processos_sem_palpites():
+    """ Termina os processos usados pela procura de Campos sem palpites (são recriados se necessário) """
+    global _EXECUTOR_SEM_PALPITES
+    if _EXECUTOR_SEM_PALPITES is not None:
+        _EXECUTOR_SEM_PALPITES[1].shutdown(wait=True, cancel_futures=True)
+        _EXECUTOR_SEM_PALPITES = None
+
+def _procura_paralela(chave, blocos, processos, limite):
+    """
+    Testa os blocos de candidatos em paralelo, com no máximo 2 blocos por
+    processo em espera, e devolve o resultado do primeiro bloco (por ordem)
+    que não é None. Um bloco só é aceite quando todos os anteriores
+    terminaram sem sucesso. No fim, os blocos ainda não iniciados são
+    cancelados; os que estão em curso terminam ao fim de, no máximo,
+    _CANDIDATOS_POR_TAREFA candidatos ou quando passa o limite
+    """
+    pendentes = deque()     # Pela ordem dos blocos
+    try:
+        executor = _executor_sem_palpites(processos)
+        for ks in blocos:
+            pendentes.append(executor.submit(_testa_candidatos, *chave, ks, limite))
+            while pendentes and (len(pendentes) >= 2 * processos or pendentes[0].done()):
+                resultado = pendentes.popleft().result()
+                if resultado is not None: return resultado
+        while pendentes:
+            resultado = pendentes.popleft().result()
+            if resultado is not None: return resultado
+    except BrokenProcessPool:
+        termina_processos_sem_palpites()
+        raise
+    finally:
+        for f in pendentes: f.cancel()
+
+def _coloca_minas_sem_palpites(m, c, g, n):
+    """
+    Colocação de minas no modo 'sem-palpites', a partir do estado atual do
+    Gerador g. Se a procura falha dentro dos limites, as minas são colocadas
+    como no modo 'gerador' (o candidato 0), para que o jogo possa continuar
+    """
+    if not isinstance(n, int) or n < 1 or n > (ord(obtem_ultima_coluna(m)) - 64) * obtem_ultima_linha(m) - 9\
+        or not eh_coordenada_do_campo(m, c): raise ValueError('coloca_minas: argumentos invalidos')
+    try:
+        k, minas, estado = gera_minas_sem_palpites(obtem_ultima_coluna(m), obtem_ultima_linha(m), n, g[0], obtem_estado(g), c,
+                                                   _PROCESSOS_SEM_PALPITES, _TENTATIVAS_SEM_PALPITES, _TEMPO_SEM_PALPITES)
+    except ValueError: return coloca_minas(m, c, g, n)
+    for v in minas: esconde_mina(obtem_parcela(m, v))
+    define_estado(g, estado)
+    return m
+
+####################################
+### Análise de dificuldade       ###
+####################################
+
+### Métricas de dificuldade calculadas diretamente sobre a máscara das minas
+### de um Campo, um inteiro usado como mapa de bits, tal como os conjuntos de
+### estados de um Campo compacto: a Parcela na coluna col e linha lin é o bit
+### (lin-1) * colunas + ord(col)-65. Cada operação de bits trata todas as
+### Parcelas de uma só vez; deslocar a máscara de 1 bit, ou de uma linha,
+### obtém as vizinhas à esquerda/direita ou acima/abaixo de todas as Parcelas.
+_MASCARAS_ANALISE = dict()  # (colunas, linhas) -> (todas as Parcelas, sem a primeira coluna, sem a última coluna)
+
+def _mascaras_analise(colunas, linhas):
+    """ Máscaras de um Campo com as dimensões dadas, criadas uma única vez por dimensão """
+    mascaras = _MASCARAS_ANALISE.get((colunas, linhas))
+    if mascaras is None:
+        linha = (1 << colunas * linhas) - 1
+        primeira = int(('0' * (colunas - 1) + '1') * linhas, 2)    # Bit da primeira coluna de cada linha
+        mascaras = _MASCARAS_ANALISE[(colunas, linhas)] = (linha, linha & ~primeira, linha & ~(primeira << colunas - 1))
+    return mascaras
+
+def mascara_minas(m):
+    """
+    (Baixo Nível)
+    Máscara das Parcelas minadas de um Campo, pela ordem de obtem_coordenadas
+
+    m (TAD)      -- Campo de Minas
+    return (int) -- Mapa de bits das minas
+    """
+    if _eh_campo_compacto(m): return m['minadas']
+    if not eh_campo(m): raise ValueError('mascara_minas: argumentos invalidos')
+    colunas = ord(obtem_ultima_coluna(m)) - 64
+    return sum(1 << (obtem_linha(c) - 1) * colunas + ord(obtem_coluna(c)) - 65 for c in obtem_coordenadas(m, 'minadas'))
+
+def mascara_minas_semente(config, s):
+    """
+    (Baixo Nível)
+    Máscara das minas que coloca_minas (no modo 'gerador') colocaria num
+    Campo novo, com a configuração e seed dadas, sem criar o Campo
+
+    config (tuple) -- (c, l, n, d, primeira Coordenada), como em analisa_semente
+    s (int)        -- Seed
+    return (int)   -- Mapa de bits das minas
+    """
+    c, l, n, d, primeira = config
+    try:
+        g = cria_gerador(d, s)
+        if not isinstance(n, int) or n < 1 or n > (ord(c) - 64)*l - 9 or not eh_coordenada_do_campo(cria_campo_compacto(c, l), primeira):
+            raise ValueError
+    except: raise ValueError('mascara_minas_semente: argumentos invalidos')
+    if s == 2 ** d: return mascara_minas(coloca_minas(cria_campo_compacto(c, l), primeira, g, n))    # Estado limite, ver atualiza_estado
+    colunas = ord(c) - 64
+    ocupadas = bytearray(b'0' * colunas * l)
+    for v in obtem_coordenadas_vizinhas(primeira) + (primeira,):    # Zona sem minas, como em coloca_minas
+        if ord(obtem_coluna(v)) - 64 <= colunas and obtem_linha(v) <= l: ocupadas[(obtem_linha(v) - 1) * colunas + ord(obtem_coluna(v)) - 65] = ord('2')
+    while n > 0:
+        estados = _xorshift(d, s, 2 * max(n, 32))       # Cada tentativa usa dois números: coluna e linha
+        s = estados[-1]
+        for col, lin in zip(estados[::2], estados[1::2]):
+            i = lin % l * colunas + col % colunas
+            if ocupadas[i] == ord('0'):
+                ocupadas[i] = ord('1')
+                n -= 1
+                if n == 0: break
+    return int(ocupadas.replace(b'2', b'0')[::-1], 2)
+
+def _dilata(x, linha, sem_primeira, sem_ultima, colunas):
+    """ Parcelas em x e as suas vizinhas """
+    x |= (x << 1) & sem_primeira | (x >> 1) & sem_ultima
+    return (x | x << colunas | x >> colunas) & linha
+
+def _componentes_bits(x, linha, sem_primeira, sem_ultima, colunas):
+    """ Componentes ligadas (incluindo na diagonal) das Parcelas em x, como mapas de bits """
+    componentes = []
+    while x:
+        comp = x & -x                           # Começa pela Parcela de menor índice ainda por atribuir
+        while True:
+            maior = _dilata(comp, linha, sem_primeira, sem_ultima, colunas) & x
+            if maior == comp: break
+            comp = maior
+        componentes.append(comp)
+        x &= ~comp
+    return componentes
+
+def planos_vizinhas(minas, colunas, linhas):
+    """
+    (Baixo Nível)
+    Número de minas vizinhas de todas as Parcelas, em 4 mapas de bits:
+    o bit de uma Parcela no plano k é o bit k da sua contagem
+
+    minas (int)    -- Máscara das minas
+    colunas (int)  -- Número de colunas
+    linhas (int)   -- Número de linhas
+    return (tuple) -- 4 mapas de bits
+    """
+    linha, sem_primeira, sem_ultima = _mascaras_analise(colunas, linhas)
+    esquerda, direita = (minas << 1) & sem_primeira, (minas >> 1) & sem_ultima   # Parcelas com mina à esquerda / à direita
+    planos = [0, 0, 0, 0]
+    for v in (esquerda, direita, esquerda << colunas & linha, minas << colunas & linha, direita << colunas & linha,
+              esquerda >> colunas, minas >> colunas, direita >> colunas):
+        for k in range(4):                      # Soma de 1 bit a todas as contagens, com propagação do transporte
+            planos[k], v = planos[k] ^ v, planos[k] & v
+            if not v: break
+    return tuple(planos)
+
+def grelha_vizinhas(minas, colunas, linhas):
+    """
+    (Baixo Nível)
+    Número de minas vizinhas de cada Parcela, um byte por Parcela, pela
+    ordem de obtem_coordenadas
+
+    minas (int)     -- Máscara das minas
+    colunas (int)   -- Número de colunas
+    linhas (int)    -- Número de linhas
+    return (bytes)  -- Contagens
+    """
+    total = colunas * linhas
+    # Cada plano é escrito em binário e lido em base 16, passando cada bit a ocupar um dígito hexadecimal;
+    # a soma dos planos, pesados por 2^k, tem então em cada dígito a contagem de uma Parcela
+    soma = sum(int(bin(p)[2:], 16) << k for k, p in enumerate(planos_vizinhas(minas, colunas, linhas)))
+    return bytes.fromhex('0' + '0'.join('{:0{}x}'.format(soma, total)[::-1]))[:total] if total else b''
+
+def metricas_dificuldade(minas, colunas, linhas):
+    """
+    (Alto Nível)
+    Métricas de dificuldade de um Campo com as minas dadas:
+        'aberturas' -- Número de aberturas (zonas ligadas de Parcelas sem minas vizinhas)
+        'tamanhos'  -- Parcelas limpas por cada abertura, incluindo a sua fronteira numerada
+        '3bv'       -- Número mínimo de jogadas para limpar o Campo: uma por abertura e
+                       uma por cada Parcela numerada fora das aberturas
+        'ilhas'     -- Número de zonas ligadas de Parcelas numeradas fora das aberturas
+
+    minas (int)   -- Máscara das minas
+    colunas (int) -- Número de colunas
+    linhas (int)  -- Número de linhas
+    return (dict) -- Métricas
+    """
+    if not all(isinstance(x, int) for x in (minas, colunas, linhas)) or colunas < 1 or linhas < 1 or not 0 <= minas < 1 << colunas * linhas:
+        raise ValueError('metricas_dificuldade: argumentos invalidos')
+    mascaras = _mascaras_analise(colunas, linhas)
+    linha = mascaras[0]
+    seguras = linha & ~minas
+    p0, p1, p2, p3 = planos_vizinhas(minas, colunas, linhas)
+    zeros = seguras & ~(p0 | p1 | p2 | p3)
+    aberturas = _componentes_bits(zeros, *mascaras, colunas)
+    isoladas = seguras & ~_dilata(zeros, *mascaras, colunas)
+    return {'aberturas': len(aberturas),
+            'tamanhos': tuple((_dilata(a, *mascaras, colunas) & seguras).bit_count() for a in aberturas),
+            '3bv': len(aberturas) + isoladas.bit_count(),
+            'ilhas': len(_componentes_bits(isoladas, *mascaras, colunas))}
@@ -0,0 +1,267 @@
+"""
+Servidor do jogo das minas, com asyncio
+
+Cada ligação (TCP ou socket Unix) é uma sessão, com o seu próprio Gerador
+e Campo. O protocolo é em linhas de texto ASCII, um comando por linha, e
+cada comando tem uma linha de resposta (exceto CAMPO):
+
+    NOVO c l n d s   -- Novo jogo, com os argumentos de minas()     -> OK c l n
+    L M03            -- Limpa a Parcela (a primeira coloca as minas) -> estado alterações
+    M M03            -- Marca ou desmarca a Parcela                  -> estado alterações
+    CAMPO            -- Desenho completo do Campo                    -> CAMPO k, seguido de k linhas
+    SAIR             -- Termina a sessão                             -> ADEUS
+
+O estado é JOGO, VITORIA ou DERROTA, e as alterações são as Parcelas cuja
+representação mudou desde a resposta anterior, na forma M03=c, em que c é
+o carater de campo_para_str ('0' em vez do espaço). Um comando inválido
+tem como resposta ERRO, seguido do motivo.
+
+Uso:
+    python servidor.py --tcp 127.0.0.1:8765       -- Serve por TCP
+    python servidor.py --unix /tmp/minas.sock     -- Serve por um socket Unix
+    python servidor.py --carga 1000               -- Teste de carga, com 1000 clientes simulados
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from projeto import *
+
+TEMPO_INATIVIDADE = 300     # Segundos sem comandos até a sessão ser terminada
+MAXIMO_SESSOES = 10000      # Sessões em simultâneo; as ligações seguintes são recusadas
+MAXIMO_LINHA = 256          # Tamanho máximo de um comando, em bytes
+
+###################
+### Sessão      ###
+###################
+
+def cria_sessao():
+    """ Cria uma sessão, ainda sem jogo """
+    return {'gerador': None, 'campo': None, 'minas': 0, 'colocadas': False, 'terminado': True}
+
+def novo_jogo(sessao, c, l, n, d, s):
+    """
+    Começa um novo jogo na sessão, validando os argumentos como minas()
+
+    sessao (dict) -- Sessão
+    c (str)       -- Ultima coluna
+    l (int)       -- Ultima linha
+    n (int)       -- Número de minas
+    d (int)       -- Dimensão do gerador (32/64 bits)
+    s (int)       -- Seed para a geração da posição de minas
+    """
+    g, m = cria_gerador(d, s), cria_campo_compacto(c, l)
+    if n < 1 or n > (ord(c) - 64) * l - 9: raise ValueError('novo_jogo: argumentos invalidos')
+    parcelas_alteradas(m)       # O cliente parte de um Campo todo tapado
+    sessao.update(gerador=g, campo=m, minas=n, colocadas=False, terminado=False)
+
+def _le_coordenada(m, s):
+    """ Coordenada do Campo m representada por s, ou None se s não a representa """
+    if len(s) != 3 or not 'A' <= s[0] <= 'Z' or not s[1:].isdigit(): return None   # str_para_coordenada usa eval
+    c = str_para_coordenada(s) if s[1:] != '00' else None
+    return c if c is not None and eh_coordenada_do_campo(m, c) else None
+
+def _alteracoes(m):
+    """ Representação das Parcelas alteradas desde a última resposta """
+    return ' '.join('{}={}'.format(coordenada_para_str(c), '0' if r == ' ' else r) for c, r in parcelas_alteradas(m))
+
+def processa_comando(sessao, linha):
+    """
+    Executa um comando do protocolo sobre a sessão. Devolve as linhas de
+    resposta e se a sessão continua. Não faz qualquer entrada ou saída,
+    podendo ser usada sem servidor
+
+    sessao (dict)  -- Sessão
+    linha (str)    -- Comando
+    return (tuple) -- (lista de linhas de resposta, bool)
+    """
+    partes = linha.split()
+    if not partes: return ['ERRO comando vazio'], True
+    comando, args = partes[0].upper(), partes[1:]
+
+    if comando == 'SAIR': return ['ADEUS'], False
+    if comando == 'NOVO':
+        try:
+            c, (l, n, d, s) = args[0], map(int, args[1:])
+            novo_jogo(sessao, c, l, n, d, s)
+        except (ValueError, IndexError): return ['ERRO argumentos invalidos'], True
+        return ['OK {} {} {}'.format(c, l, n)], True
+    if sessao['campo'] is None: return ['ERRO sem jogo'], True
+
+    m = sessao['campo']
+    if comando == 'CAMPO':
+        desenho = campo_para_str(m).split('\n')
+        return ['CAMPO {}'.format(len(desenho))] + desenho, True
+    if comando not in ('L', 'M') or len(args) != 1: return ['ERRO comando desconhecido'], True
+    if sessao['terminado']: return ['ERRO jogo terminado'], True
+    target = _le_coordenada(m, args[0].upper())
+    if target is None: return ['ERRO coordenada invalida'], True
+
+    anterior = define_modo_confianca(True)  # A Coordenada já foi validada, e o Campo foi criado pelo módulo
+    try:
+        if comando == 'L' and not sessao['colocadas']:  # Tal como em minas(), a primeira limpeza é sempre segura
+            coloca_minas(m, target, sessao['gerador'], sessao['minas'])
+            sessao['colocadas'] = True
+        if not aplica_jogada(m, comando, target): estado = 'DERROTA'
+        elif jogo_ganho(m): estado = 'VITORIA'
+        else: estado = 'JOGO'
+    finally: define_modo_confianca(anterior)
+    sessao['terminado'] = estado != 'JOGO'
+    return ['{} {}'.format(estado, _alteracoes(m)).rstrip()], True
+
+###################
+### Servidor    ###
+###################
+
+async def _atende(reader, writer, servidor):
+    """ Atende uma ligação, até o cliente sair, ficar inativo ou a ligação falhar """
+    if servidor['sessoes'] >= servidor['maximo']:
+        writer.write(b'ERRO servidor ocupado\n')
+        writer.close()
+        return
+    servidor['sessoes'] += 1
+    sessao = cria_sessao()
+    try:
+        while True:
+            try: linha = await asyncio.wait_for(reader.readline(), servidor['inatividade'])
+            except asyncio.TimeoutError:
+                writer.write(b'ERRO inatividade\n')
+                break
+            except ValueError:          # Linha maior do que MAXIMO_LINHA
+                writer.write(b'ERRO comando demasiado longo\n')
+                break
+            if not linha: break
+            respostas, continua = processa_comando(sessao, linha.decode('ascii', 'replace'))
+            writer.write(('\n'.join(respostas) + '\n').encode('ascii'))
+            await writer.drain()        # Não lê o comando seguinte enquanto o cliente não consumir as respostas
+            if not continua: break
+    except ConnectionError: pass
+    finally:
+        servidor['sessoes'] -= 1
+        writer.close()
+        try: await writer.wait_closed()
+        except ConnectionError: pass
+
+async def inicia_servidor(endereco, inatividade=TEMPO_INATIVIDADE, maximo=MAXIMO_SESSOES):
+    """
+    Começa a servir o jogo no endereço dado, devolvendo o servidor asyncio
+    (ver asyncio.Server) e o seu estado, com o número de sessões ativas
+
+    endereco (tuple|str) -- (anfitrião, porta) para TCP, ou o caminho de um socket Unix
+    inatividade (float)  -- Segundos sem comandos até uma sessão ser terminada
+    maximo (int)         -- Número máximo de sessões em simultâneo
+    return (tuple)       -- (asyncio.Server, dict)
+    """
+    estado = {'sessoes': 0, 'maximo': maximo, 'inatividade': inatividade}
+    atende = lambda reader, writer: _atende(reader, writer, estado)
+    if isinstance(endereco, tuple):
+        servidor = await asyncio.start_server(atende, *endereco, limit=MAXIMO_LINHA, backlog=4096)
+    else: servidor = await asyncio.start_unix_server(atende, endereco, limit=MAXIMO_LINHA, backlog=4096)
+    return servidor, estado
+
+###################
+### Cliente     ###
+###################
+
+async def _liga(endereco):
+    if isinstance(endereco, tuple): return await asyncio.open_connection(*endereco)
+    return await asyncio.open_unix_connection(endereco)
+
+async def cliente_simulado(endereco, config, seed, jogos=1):
+    """
+    Cliente que joga pelo protocolo, escolhendo ao acaso, entre as Parcelas
+    tapadas, a próxima a limpar. Devolve os resultados dos jogos e o tempo
+    de resposta de cada comando, em segundos
+
+    endereco (tuple|str) -- Endereço do servidor
+    config (tuple)       -- (c, l, n, d), como em minas()
+    seed (int)           -- Seed dos jogos, e das escolhas do cliente
+    jogos (int)          -- Número de jogos
+    return (tuple)       -- (lista de resultados, lista de tempos)
+    """
+    reader, writer = await _liga(endereco)
+    c, l, n, d = config
+    escolhas, resultados, tempos = random.Random(seed), [], []
+
+    async def pede(comando):
+        inicio = time.perf_counter()
+        writer.write(comando.encode('ascii') + b'\n')
+        await writer.drain()
+        resposta = (await reader.readline()).decode('ascii').split()
+        tempos.append(time.perf_counter() - inicio)
+        if not resposta or resposta[0] == 'ERRO': raise ConnectionError(' '.join(resposta) or 'ligação terminada')
+        return resposta
+
+    try:
+        for j in range(jogos):
+            await pede('NOVO {} {} {} {} {}'.format(c, l, n, d, seed + j))
+            tapadas = ['{}{:02d}'.format(chr(col), lin) for col in range(65, ord(c) + 1) for lin in range(1, l + 1)]
+            jogada, estado = '{}{:02d}'.format(chr((65 + ord(c)) // 2), (l + 1) // 2), 'JOGO'
+            while estado == 'JOGO':
+                estado, *alteracoes = await pede('L ' + jogada)
+                limpas = {a[:3] for a in alteracoes if a[4] not in '#@'}
+                tapadas = [t for t in tapadas if t not in limpas] if limpas else tapadas
+                if tapadas: jogada = escolhas.choice(tapadas)
+            resultados.append(estado)
+        await pede('SAIR')
+    finally:
+        writer.close()
+        try: await writer.wait_closed()
+        except ConnectionError: pass
+    return resultados, tempos
+
+async def carga(endereco, clientes, config=('P', 16, 40, 32), jogos=1, seed=1):
+    """
+    Corre 'clientes' clientes simulados em simultâneo contra o servidor no
+    endereço dado, e devolve um resumo: jogos, vitórias, comandos, duração
+    e tempos de resposta (mediana e percentil 99, em segundos, ou None se
+    nenhum comando teve resposta). Os clientes cuja ligação falha são
+    contados em 'falhas'
+    """
+    inicio = time.perf_counter()
+    corridas = await asyncio.gather(*(cliente_simulado(endereco, config, seed + k * jogos, jogos) for k in range(clientes)),
+                                    return_exceptions=True)
+    duracao = time.perf_counter() - inicio
+    falhas = sum(1 for c in corridas if isinstance(c, BaseException))
+    corridas = [c for c in corridas if not isinstance(c, BaseException)]
+    resultados = [r for rs, ts in corridas for r in rs]
+    tempos = sorted(t for rs, ts in corridas for t in ts)
+    return {'clientes': clientes, 'falhas': falhas, 'jogos': len(resultados), 'vitorias': resultados.count('VITORIA'),
+            'comandos': len(tempos), 'duracao': duracao, 'mediana': statistics.median(tempos) if tempos else None,
+            'p99': tempos[int(0.99 * (len(tempos) - 1))] if tempos else None}
+
+async def _principal(args):
+    if args.tcp:
+        anfitriao, porta = args.tcp.rsplit(':', 1)
+        endereco = (anfitriao, int(porta))
+    elif args.unix: endereco = args.unix
+    else: endereco = os.path.join(tempfile.mkdtemp(), 'minas.sock')
+
+    servidor, estado = await inicia_servidor(endereco, args.inatividade)
+    async with servidor:
+        if not args.carga: return await servidor.serve_forever()
+        resumo = await carga(endereco, args.carga, jogos=args.jogos)
+        print('{clientes} clientes ({falhas} falhas), {jogos} jogos ({vitorias} vitórias), {comandos} comandos em {duracao:.2f} s'.format(**resumo))
+        if resumo['comandos']:
+            print('{:.0f} comandos/s, resposta mediana {:.2f} ms, p99 {:.2f} ms'.format(
+                resumo['comandos'] / resumo['duracao'], resumo['mediana'] * 1000, resumo['p99'] * 1000))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor do jogo das minas')
+    parser.add_argument('--tcp', help='anfitrião:porta onde servir')
+    parser.add_argument('--unix', help='caminho do socket Unix onde servir')
+    parser.add_argument('--inatividade', type=float, default=TEMPO_INATIVIDADE, help='segundos até terminar uma sessão inativa')
+    parser.add_argument('--carga', type=int, default=0, help='corre o número dado de clientes simulados e termina')
+    parser.add_argument('--jogos', type=int, default=1, help='jogos por cliente simulado')
+    args = parser.parse_args(argv)
+    try: asyncio.run(_principal(args))
+    except KeyboardInterrupt: pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,37 @@
+"""
+Enumeração exaustiva das configurações de minas consistentes com a
+informação visível de um Campo pequeno, para comparar com o Resolvedor e
+com probabilidades_minas
+"""
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from projeto import *
+
+def configuracoes_consistentes(m, n):
+    """
+    Devolve todas as configurações de 'n' minas nas Parcelas não limpas do
+    Campo que respeitam os números de todas as Parcelas limpas
+
+    m (dict)      -- Campo
+    n (int)       -- Número total de minas
+    return (list) -- Lista de conjuntos de Coordenadas minadas
+    """
+    escondidas = obtem_coordenadas(m, 'tapadas') + obtem_coordenadas(m, 'marcadas')
+    limpas = [(c, obtem_numero_minas_vizinhas(m, c), [v for v in obtem_coordenadas_vizinhas(c) if eh_coordenada_do_campo(m, v)])
+              for c in obtem_coordenadas(m, 'limpas')]
+    res = []
+    for minas in itertools.combinations(escondidas, n):
+        minas = set(minas)
+        if all(sum(v in minas for v in viz) == k for c, k, viz in limpas): res.append(minas)
+    return res
+
+def campo_pequeno(c, l, n, s, primeira):
+    """ Campo compacto com 'n' minas colocadas pela seed 's' e a primeira Parcela limpa """
+    m = cria_campo_compacto(c, l)
+    coloca_minas(m, primeira, cria_gerador(32, s), n)
+    limpa_campo(m, primeira)
+    return m
@@ -0,0 +1,57 @@
+"""
+As métricas calculadas sobre pilhas de Campos têm de coincidir, Campo a
+Campo, com as de metricas_dificuldade e grelha_vizinhas, incluindo nas
+pilhas em que as componentes de Campos diferentes terminam em iterações
+diferentes
+"""
+import random
+
+from bruto import *
+import analise
+from analise import *
+
+DIMENSOES = ((9, 9), (16, 16), (26, 16), (1, 1), (1, 7), (7, 1), (3, 3), (8, 2))
+
+def mascaras_aleatorias(colunas, linhas, quantas, seed):
+    """ Máscaras com densidades de minas entre 0 e 1, incluindo o Campo vazio e o Campo cheio """
+    r = random.Random(seed)
+    total = colunas * linhas
+    res = [0, (1 << total) - 1]
+    for _ in range(quantas):
+        densidade = r.random()
+        res.append(sum(1 << i for i in range(total) if r.random() < densidade))
+    return res
+
+def test_pilha_igual_a_campo_a_campo():
+    for colunas, linhas in DIMENSOES:
+        mascaras = mascaras_aleatorias(colunas, linhas, 60, colunas * 100 + linhas)
+        assert metricas_mascaras(mascaras, colunas, linhas) == [metricas_dificuldade(x, colunas, linhas) for x in mascaras], (colunas, linhas)
+        assert grelhas_vizinhas(mascaras, colunas, linhas) == [grelha_vizinhas(x, colunas, linhas) for x in mascaras], (colunas, linhas)
+    assert metricas_mascaras([], 9, 9) == [] and grelhas_vizinhas([], 9, 9) == []
+
+def test_sementes_e_campos():
+    config = ('P', 16, 40, 32, cria_coordenada('H', 8))
+    anterior, analise._PILHA = analise._PILHA, 7       # Vários blocos, o último incompleto
+    try:
+        res = list(metricas_sementes(config, range(1, 31)))
+        assert [s for s, _ in res] == list(range(1, 31))
+        assert [r for _, r in res] == [metricas_dificuldade(mascara_minas_semente(config, s), 16, 16) for s in range(1, 31)]
+        # Campos com dimensões diferentes, seguidos, não podem ser empilhados juntos
+        campos = [coloca_minas(cria_campo_compacto(c, l), cria_coordenada('A', 1), cria_gerador(32, s), n)
+                  for s in range(1, 6) for c, l, n in (('I', 9, 10), ('I', 9, 20), ('P', 16, 40), ('C', 5, 3))]
+        assert list(metricas_campos(campos)) == [metricas_dificuldade(mascara_minas(m), ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m))
+                                                for m in campos]
+    finally: analise._PILHA = anterior
+
+def test_argumentos_invalidos():
+    for args in (([1 << 81], 9, 9), ([-1], 9, 9), ([0], 0, 9), ((0.5,), 9, 9), (0, 9, 9)):
+        try:
+            metricas_mascaras(*args)
+            assert False, args
+        except ValueError as e: assert str(e) == 'cria_pilha: argumentos invalidos'
+
+if __name__ == '__main__':
+    test_pilha_igual_a_campo_a_campo()
+    test_sementes_e_campos()
+    test_argumentos_invalidos()
+    print('ok')
@@ -0,0 +1,77 @@
+"""
+Representação binária: Campos (em dicionário e compactos) e Geradores têm
+de ser recuperados exatamente, incluindo minas, Parcelas limpas e marcadas
+"""
+import os
+import tempfile
+
+from bruto import *
+
+def campo_a_meio(cria, c, l, n, s):
+    """ Campo com minas, algumas Parcelas limpas e algumas bandeiras """
+    m = cria(c, l)
+    coloca_minas(m, cria_coordenada('A', 1), cria_gerador(32, s), n)
+    limpa_campo(m, cria_coordenada('A', 1))
+    tapadas = obtem_coordenadas(m, 'tapadas')
+    for x in tapadas[::5]: alterna_bandeira(obtem_parcela(m, x))
+    for x in tapadas[2::7]:
+        if not eh_parcela_minada(obtem_parcela(m, x)): limpa_campo(m, x)
+    return m
+
+def mesmo_campo(m1, m2):
+    return campo_para_str(m1) == campo_para_str(m2) and all(
+        obtem_coordenadas(m1, s) == obtem_coordenadas(m2, s) for s in ('limpas', 'tapadas', 'marcadas', 'minadas'))
+
+def test_campo_ida_e_volta():
+    # O Campo em dicionário é lento em Campos grandes, pelo que o Z99 é apenas compacto
+    for c, l, n, construtores in (('A', 5, 1, (cria_campo, cria_campo_compacto)), ('C', 3, 0, (cria_campo, cria_campo_compacto)),
+                                  ('E', 7, 6, (cria_campo, cria_campo_compacto)), ('I', 9, 10, (cria_campo, cria_campo_compacto)),
+                                  ('Z', 99, 400, (cria_campo_compacto,))):
+        for s in range(1, 4):
+            codificados = set()
+            for cria in construtores:
+                m = campo_a_meio(cria, c, l, n, s) if n else cria(c, l)
+                b = campo_para_bytes(m)
+                m2 = bytes_para_campo(b)
+                assert mesmo_campo(m, m2), (c, l, n, s, cria)
+                assert campo_para_bytes(m2) == b and len(b) == 6 + 3 * (((ord(c) - 64) * l + 7) // 8)
+                codificados.add(b)
+            assert len(codificados) == 1, (c, l, n, s)
+
+def test_gerador_ida_e_volta():
+    for d in (32, 64):
+        for s in (1, 2, 2 ** d - 1):
+            g = cria_gerador(d, s)
+            for _ in range(3): atualiza_estado(g)
+            g2 = bytes_para_gerador(gerador_para_bytes(g))
+            assert geradores_iguais(g, g2)
+            assert [atualiza_estado(g) for _ in range(10)] == [atualiza_estado(g2) for _ in range(10)]
+
+def test_dados_invalidos():
+    b = campo_para_bytes(cria_campo_compacto('C', 3))
+    for x in (b[:-1], b + b'\0', b'XYZ' + b[3:], b[:3] + b'\x09' + b[4:]):
+        try: bytes_para_campo(x)
+        except ValueError: continue
+        assert False, x
+    try: bytes_para_gerador(gerador_para_bytes(cria_gerador(32, 1))[:-1])
+    except ValueError: pass
+    else: assert False
+
+def test_arquivo():
+    campos = [campo_a_meio(cria_campo_compacto, 'I', 9, 10, s) for s in range(1, 8)]
+    with tempfile.TemporaryDirectory() as pasta:
+        caminho = os.path.join(pasta, 'campos.arq')
+        assert escreve_arquivo_campos(caminho, campos[:3]) == 3
+        assert escreve_arquivo_campos(caminho, campos[3:]) == 7
+        arq = abre_arquivo_campos(caminho)
+        try:
+            assert numero_campos_arquivo(arq) == 7
+            for i in (6, 0, 3): assert mesmo_campo(le_campo_arquivo(arq, i), campos[i])
+        finally: fecha_arquivo_campos(arq)
+
+if __name__ == '__main__':
+    test_campo_ida_e_volta()
+    test_gerador_ida_e_volta()
+    test_dados_invalidos()
+    test_arquivo()
+    print('ok')
@@ -0,0 +1,61 @@
+"""
+Campos por blocos: um bloco esquecido é recriado com as mesmas minas, e a
+limpeza que atravessa blocos coincide com a de um Campo compacto com as
+mesmas minas
+"""
+from bruto import *
+
+COLUNAS, LINHAS = 26, 40     # Zona comparada com um Campo compacto, a partir da posição (0, 0)
+
+def minas_zona(m):
+    return [(col, lin) for lin in range(LINHAS) for col in range(COLUNAS) if eh_parcela_minada_blocos(m, (col, lin))]
+
+def test_blocos_recriados_iguais():
+    for d in (32, 64):
+        m = cria_campo_blocos(7, 0.2, d, tamanho=8, maximo=1)     # Cada bloco novo faz esquecer o anterior
+        minas = minas_zona(m)
+        assert conta_blocos(m) == (0, 1)
+        assert minas_zona(m) == minas
+        assert minas_zona(cria_campo_blocos(7, 0.2, d, tamanho=8)) == minas
+        assert minas_zona(cria_campo_blocos(8, 0.2, d, tamanho=8)) != minas
+        # Cada bloco (inteiro, longe do início) tem o número de minas pedido
+        for bx in range(COLUNAS // 8):
+            for by in range(LINHAS // 8):
+                assert sum(bx * 8 <= c < bx * 8 + 8 and by * 8 <= l < by * 8 + 8 for c, l in minas) == 13
+
+def test_inicio_seguro():
+    for s in range(1, 30):
+        m = cria_campo_blocos(s, 0.9, tamanho=2, inicio=(s, -s))
+        assert not any(eh_parcela_minada_blocos(m, (s + i, -s + j)) for i in (-1, 0, 1) for j in (-1, 0, 1))
+        limpa_campo(m, (s, -s))
+        assert eh_parcela_limpa_blocos(m, (s, -s))
+
+def compacto_da_zona(m):
+    """ Campo compacto com as minas da zona COLUNAS x LINHAS do Campo por blocos """
+    mc = cria_campo_compacto(chr(64 + COLUNAS), LINHAS)
+    for col, lin in minas_zona(m): esconde_mina(obtem_parcela(mc, cria_coordenada(chr(65 + col), lin + 1)))
+    return mc
+
+def test_limpeza_entre_blocos_igual_a_compacto():
+    comparadas = 0
+    for s in range(1, 6):
+        referencia = cria_campo_blocos(s, 0.12, tamanho=8, inicio=(-100, -100))
+        for col in range(1, COLUNAS - 1, 3):
+            for lin in range(1, LINHAS - 1, 3):
+                if eh_parcela_minada_blocos(referencia, (col, lin)) or minas_vizinhas_blocos(referencia, (col, lin)): continue
+                m = cria_campo_blocos(s, 0.12, tamanho=8, inicio=(-100, -100))
+                limpa_campo(m, (col, lin))
+                limpas = {(c, l) for c in range(COLUNAS) for l in range(LINHAS) if eh_parcela_limpa_blocos(m, (c, l))}
+                if any(c in (0, COLUNAS - 1) or l in (0, LINHAS - 1) for c, l in limpas): continue   # Pode ter saído da zona
+                mc = limpa_campo(compacto_da_zona(m), cria_coordenada(chr(65 + col), lin + 1))
+                assert {(ord(obtem_coluna(c)) - 65, obtem_linha(c) - 1) for c in obtem_coordenadas(mc, 'limpas')} == limpas, (s, col, lin)
+                for c, l in limpas:
+                    assert minas_vizinhas_blocos(m, (c, l)) == obtem_numero_minas_vizinhas(mc, cria_coordenada(chr(65 + c), l + 1))
+                comparadas += len({(c // 8, l // 8) for c, l in limpas}) > 1
+    assert comparadas >= 10     # Limpezas que atravessam pelo menos uma fronteira entre blocos
+
+if __name__ == '__main__':
+    test_blocos_recriados_iguais()
+    test_inicio_seguro()
+    test_limpeza_entre_blocos_igual_a_compacto()
+    print('ok')
@@ -0,0 +1,33 @@
+"""
+Fora dos limites, o Campo compacto tem de se comportar como o Campo em
+dicionário: levantar o mesmo erro e nunca alterar outra Parcela
+"""
+from bruto import *
+
+def erro(f, *args):
+    try: f(*args)
+    except Exception as e: return type(e)
+
+def test_coordenadas_fora_do_campo():
+    for c in (cria_coordenada('D', 1), cria_coordenada('A', 4), cria_coordenada('A', 5), cria_coordenada('Z', 99)):
+        campos = cria_campo('C', 3), cria_campo_compacto('C', 3)
+        for f in (obtem_parcela, limpa_campo):
+            assert erro(f, campos[0], c) is not None
+            assert erro(f, campos[0], c) == erro(f, campos[1], c), (f, c)
+        for m in campos: assert obtem_coordenadas(m, 'limpas') == ()
+
+def test_limpa_campo_igual_nos_dois_campos():
+    for s in range(1, 5):
+        m1, m2 = cria_campo('I', 9), cria_campo_compacto('I', 9)
+        for m in (m1, m2): coloca_minas(m, cria_coordenada('E', 5), cria_gerador(32, s), 10)
+        for c in obtem_coordenadas(m1, 'tapadas'):
+            if eh_parcela_minada(obtem_parcela(m1, c)): continue
+            limpa_campo(m1, c)
+            limpa_campo(m2, c)
+            assert obtem_coordenadas(m1, 'limpas') == obtem_coordenadas(m2, 'limpas'), (s, c)
+        assert campo_para_str(m1) == campo_para_str(m2), s
+
+if __name__ == '__main__':
+    test_coordenadas_fora_do_campo()
+    test_limpa_campo_igual_nos_dois_campos()
+    print('ok')
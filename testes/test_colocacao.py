@@ -0,0 +1,39 @@
+"""
+Na colocação por Fisher-Yates, as vizinhas da primeira jogada que ficam
+fora do Campo não podem excluir Parcelas do Campo (uma coluna a mais à
+direita corresponde, em índice, à primeira coluna da linha seguinte)
+"""
+from bruto import *
+
+def zona(m, c):
+    return {v for v in obtem_coordenadas_vizinhas(c) + (c,) if eh_coordenada_do_campo(m, v)}
+
+def test_vizinhas_fora_do_campo_nao_sao_excluidas():
+    for col, lin in (('D', 1), ('D', 2), ('D', 4), ('A', 4), ('B', 4)):
+        primeira = cria_coordenada(col, lin)
+        for cria in (cria_campo, cria_campo_compacto):
+            livres = 16 - len(zona(cria('D', 4), primeira))
+            m = coloca_minas(cria('D', 4), primeira, cria_gerador(32, 1), livres, 'fisher-yates')
+            assert set(obtem_coordenadas(m, 'minadas')) == set(obtem_coordenadas(m, 'tapadas')) - zona(m, primeira)
+
+def test_todas_as_parcelas_fora_da_zona_podem_ser_minadas():
+    primeira, vistas = cria_coordenada('D', 1), set()
+    for s in range(1, 200):
+        m = coloca_minas(cria_campo_compacto('D', 4), primeira, cria_gerador(32, s), 1, 'fisher-yates')
+        vistas.update(obtem_coordenadas(m, 'minadas'))
+    m = cria_campo_compacto('D', 4)
+    assert vistas == set(obtem_coordenadas(m, 'tapadas')) - zona(m, primeira)
+
+def test_resolvedor_sem_vizinhas_fora_do_campo():
+    for s in range(1, 21):
+        m = campo_pequeno('D', 4, 3, s, cria_coordenada('D', 1))
+        r = cria_resolvedor(m)
+        resolve_campo(r)
+        for celulas, k in r['restricoes'].values(): assert all(eh_coordenada_do_campo(m, c) for c in celulas), s
+        assert all(eh_coordenada_do_campo(m, c) for c in r['celulas'].keys() | r['minas'] | r['seguras']), s
+
+if __name__ == '__main__':
+    test_vizinhas_fora_do_campo_nao_sao_excluidas()
+    test_todas_as_parcelas_fora_da_zona_podem_ser_minadas()
+    test_resolvedor_sem_vizinhas_fora_do_campo()
+    print('ok')
@@ -0,0 +1,68 @@
+"""
+As métricas calculadas sobre máscaras de bits têm de coincidir com um
+cálculo Parcela a Parcela feito apenas com o TAD Campo, e
+mascara_minas_semente tem de colocar as mesmas minas que coloca_minas
+"""
+from bruto import *
+from analise import grelhas_vizinhas, metricas_campos
+
+def metricas_tad(m):
+    """ Aberturas, 3BV, ilhas e contagens de minas vizinhas, pela definição """
+    colunas, linhas = ord(obtem_ultima_coluna(m)) - 64, obtem_ultima_linha(m)
+    coords = [cria_coordenada(chr(65 + c), l) for l in range(1, linhas + 1) for c in range(colunas)]
+    numero = {c: obtem_numero_minas_vizinhas(m, c) for c in coords}
+    mina = {c: eh_parcela_minada(obtem_parcela(m, c)) for c in coords}
+    vizinhas = {c: [v for v in obtem_coordenadas_vizinhas(c) if eh_coordenada_do_campo(m, v)] for c in coords}
+
+    def componente(c, pertence):
+        comp, pilha = {c}, [c]
+        while pilha:
+            for v in vizinhas[pilha.pop()]:
+                if pertence(v) and v not in comp:
+                    comp.add(v)
+                    pilha.append(v)
+        return comp
+
+    vistas, reveladas, tamanhos = set(), set(), []
+    for c in coords:
+        if mina[c] or numero[c] or c in vistas: continue
+        zeros = componente(c, lambda v: not mina[v] and numero[v] == 0)
+        vistas |= zeros
+        abertura = zeros | {v for x in zeros for v in vizinhas[x]}
+        reveladas |= abertura
+        tamanhos.append(len(abertura))
+    isoladas = [c for c in coords if not mina[c] and c not in reveladas]
+    vistas, ilhas = set(), 0
+    for c in isoladas:
+        if c in vistas: continue
+        ilhas += 1
+        vistas |= componente(c, lambda v: not mina[v] and v not in reveladas)
+    return ({'aberturas': len(tamanhos), 'tamanhos': tuple(tamanhos), '3bv': len(tamanhos) + len(isoladas), 'ilhas': ilhas},
+            bytes(numero[c] for c in coords))
+
+CONFIGURACOES = (('I', 9, 10), ('P', 16, 40), ('Z', 16, 99), ('A', 12, 2), ('C', 3, 0))
+
+def test_metricas_e_grelha():
+    for c, l, n in CONFIGURACOES:
+        primeira = cria_coordenada(chr((ord(c) + 65) // 2), (l + 1) // 2)
+        for s in range(1, 9):
+            m = cria_campo_compacto(c, l)
+            if n: coloca_minas(m, primeira, cria_gerador(32, s), n)
+            metricas, grelha = metricas_tad(m)
+            assert list(metricas_campos([m]))[0] == metricas, (c, l, n, s)
+            assert metricas_dificuldade(mascara_minas(m), ord(c) - 64, l) == metricas, (c, l, n, s)
+            assert grelha_vizinhas(mascara_minas(m), ord(c) - 64, l) == grelha, (c, l, n, s)
+            assert grelhas_vizinhas([mascara_minas(m)], ord(c) - 64, l) == [grelha], (c, l, n, s)
+
+def test_mascara_minas_semente():
+    for c, l, n in CONFIGURACOES[:-1] + (('Z', 99, 400),):
+        primeira = cria_coordenada(chr((ord(c) + 65) // 2), (l + 1) // 2)
+        for d in (32, 64):
+            for s in range(1, 9):
+                m = coloca_minas(cria_campo_compacto(c, l), primeira, cria_gerador(d, s), n)
+                assert mascara_minas_semente((c, l, n, d, primeira), s) == mascara_minas(m), (c, l, n, d, s)
+
+if __name__ == '__main__':
+    test_metricas_e_grelha()
+    test_mascara_minas_semente()
+    print('ok')
@@ -0,0 +1,34 @@
+"""
+probabilidades_minas tem de coincidir com a fração das configurações de
+minas consistentes em que cada Parcela está minada
+"""
+from bruto import *
+
+def verifica_probabilidades(m, n, r=None):
+    configuracoes = configuracoes_consistentes(m, n)
+    p = probabilidades_minas(m, n, r)
+    escondidas = obtem_coordenadas(m, 'tapadas') + obtem_coordenadas(m, 'marcadas')
+    assert sorted(p) == sorted(escondidas)
+    for c in escondidas:
+        assert abs(p[c] - sum(c in x for x in configuracoes) / len(configuracoes)) < 1e-9, c
+    return p
+
+def test_probabilidades_inicio():
+    for s in range(1, 16):
+        verifica_probabilidades(campo_pequeno('E', 5, 5, s, cria_coordenada('A', 1)), 5)
+
+def test_probabilidades_ao_longo_do_jogo():
+    # Joga sempre a Parcela menos provável, reutilizando o Resolvedor
+    for s in range(1, 9):
+        m = campo_pequeno('F', 4, 4, s, cria_coordenada('A', 1))
+        r = cria_resolvedor(m)
+        while not jogo_ganho(m):
+            p = verifica_probabilidades(m, 4, r)
+            c = min(p, key=p.get)
+            if eh_parcela_minada(obtem_parcela(m, c)): break
+            limpa_campo(m, c)
+
+if __name__ == '__main__':
+    test_probabilidades_inicio()
+    test_probabilidades_ao_longo_do_jogo()
+    print('ok')
@@ -0,0 +1,63 @@
+"""
+Os jogos gravados por simula_jogo têm de ser reproduzidos por
+repete_registo e repete_jogadas com o mesmo resultado, o mesmo número de
+turnos e o mesmo Campo final, incluindo quando se começa a meio de um jogo
+"""
+import io
+
+from bruto import *
+
+def grava_jogos(sementes, intervalo=16):
+    f, finais = io.BytesIO(), []
+    for s in sementes:
+        st = simula_jogo('P', 16, 40, 32, s, jogador_resolvedor(), registo=f, intervalo=intervalo)
+        finais.append((st['resultado'], st['turnos'], campo_para_bytes(st['campo'])))
+    return f.getvalue(), finais
+
+def jogadas(b, inicio, turno=0):
+    """ Consome repete_jogadas, devolvendo as jogadas e a posição do jogo seguinte """
+    res, gen = [], repete_jogadas(b, inicio, turno)
+    while True:
+        try: t, acao, c, resultado, m = next(gen)
+        except StopIteration as e: return res, e.value[1]
+        res.append((t, acao, c, resultado, campo_para_bytes(m)))
+
+def test_repete_registo():
+    b, finais = grava_jogos(range(1, 31))
+    jogos = list(repete_registo(b, verifica=True))
+    assert len(jogos) == len(finais)
+    for (resultado, turnos, campo), j in zip(finais, jogos):
+        assert j['resultado'] == j['registado'] == resultado and j['divergencia'] is None
+        assert j['turnos'] == turnos and campo_para_bytes(j['campo']) == campo
+
+def test_repete_jogadas_a_meio():
+    b, finais = grava_jogos(range(1, 6), intervalo=8)
+    i = 0
+    for resultado, turnos, campo in finais:
+        todas, seguinte = jogadas(b, i)
+        assert todas[-1][4] == campo
+        for t in range(len(todas) + 2): assert jogadas(b, i, t)[0] == todas[t:], t
+        i = seguinte
+    assert i == len(b)
+
+def test_modo_confianca_entre_jogadas():
+    # Entre jogadas corre o código de quem chama, que não pode ficar em modo de confiança
+    b, _ = grava_jogos(range(1, 3))
+    a, c = repete_jogadas(b, 0), repete_jogadas(b, 0)
+    next(a)
+    assert define_modo_confianca(False) is False
+    next(c)
+    assert define_modo_confianca(False) is False
+    for _ in a: assert define_modo_confianca(False) is False
+    for _ in c: assert define_modo_confianca(False) is False
+    for _ in repete_registo(b): assert define_modo_confianca(False) is False
+    parado = repete_jogadas(b, 0)
+    next(parado)
+    parado.close()
+    assert define_modo_confianca(False) is False
+
+if __name__ == '__main__':
+    test_repete_registo()
+    test_repete_jogadas_a_meio()
+    test_modo_confianca_entre_jogadas()
+    print('ok')
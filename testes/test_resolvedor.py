@@ -0,0 +1,37 @@
+"""
+O Resolvedor só pode indicar como seguras (ou minadas) as Parcelas que o
+são em todas as configurações de minas consistentes com o Campo
+"""
+from bruto import *
+
+def verifica_resolvedor(m, n):
+    configuracoes = configuracoes_consistentes(m, n)
+    seguras, minadas = resolve_campo(cria_resolvedor(m))
+    for c in seguras: assert not any(c in x for x in configuracoes), c
+    for c in minadas: assert all(c in x for x in configuracoes), c
+    return seguras
+
+def test_resolvedor_campos_pequenos():
+    for s in range(1, 16):
+        m = campo_pequeno('E', 5, 5, s, cria_coordenada('A', 1))
+        while not jogo_ganho(m):
+            seguras = verifica_resolvedor(m, 5)
+            if not seguras: break
+            limpa_campo(m, seguras[0])
+
+def test_resolvedor_campos_medios():
+    # Sem enumeração: as conclusões têm de coincidir com as minas verdadeiras
+    for s in range(1, 21):
+        m = campo_pequeno('P', 16, 40, s, cria_coordenada('H', 8))
+        r = cria_resolvedor(m)
+        while not jogo_ganho(m):
+            seguras, minadas = resolve_campo(r)
+            assert all(eh_parcela_minada(obtem_parcela(m, c)) for c in minadas), s
+            assert not any(eh_parcela_minada(obtem_parcela(m, c)) for c in seguras), s
+            if not seguras: break
+            limpa_campo(m, seguras[0])
+
+if __name__ == '__main__':
+    test_resolvedor_campos_pequenos()
+    test_resolvedor_campos_medios()
+    print('ok')
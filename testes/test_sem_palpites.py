@@ -0,0 +1,71 @@
+"""
+Campos sem palpites: o candidato aceite não depende do número de processos
+e resolve-se sem palpites; quando não existe nenhum dentro dos limites, a
+procura termina a tempo e coloca_minas recorre ao modo 'gerador'
+"""
+from time import perf_counter
+
+from bruto import *
+
+import projeto
+
+PRIMEIRA = cria_coordenada('E', 5)
+
+def resolve_sem_palpites(c, l, minas):
+    m = cria_campo_compacto(c, l)
+    for x in minas: esconde_mina(obtem_parcela(m, x))
+    limpa_campo(m, PRIMEIRA)
+    r = cria_resolvedor(m)
+    while not jogo_ganho(m):
+        seguras = resolve_campo(r)[0]
+        if not seguras: return False
+        for x in seguras: limpa_campo(m, x)
+    return True
+
+def test_deterministico():
+    for s in range(1, 9):
+        projeto._CACHE_SEM_PALPITES.clear()
+        um = gera_minas_sem_palpites('I', 9, 20, 32, s, PRIMEIRA, processos=1)
+        projeto._CACHE_SEM_PALPITES.clear()
+        dois = gera_minas_sem_palpites('I', 9, 20, 32, s, PRIMEIRA, processos=2)
+        assert um == dois, s
+        assert len(um[1]) == 20 and resolve_sem_palpites('I', 9, um[1]), s
+        g = cria_gerador(32, s)
+        m = coloca_minas(cria_campo_compacto('I', 9), PRIMEIRA, g, 20, 'sem-palpites')
+        assert obtem_coordenadas(m, 'minadas') == um[1] and obtem_estado(g) == um[2]
+    assert projeto._EXECUTOR_SEM_PALPITES is not None      # Os processos ficam criados para as procuras seguintes
+    termina_processos_sem_palpites()
+
+def test_densidade_sem_solucao():
+    # Com 50 minas num Campo 9x9 nenhum candidato se resolve sem palpites
+    for processos in (1, 2):
+        for limites in ({'tentativas': 40}, {'tempo': 0.3}):
+            inicio = perf_counter()
+            try: gera_minas_sem_palpites('I', 9, 50, 32, 1, PRIMEIRA, processos=processos, **limites)
+            except ValueError: pass
+            else: assert False, limites
+            assert perf_counter() - inicio < 5, limites
+    termina_processos_sem_palpites()
+
+def test_recurso_ao_modo_gerador():
+    anterior = projeto._TEMPO_SEM_PALPITES
+    projeto._TEMPO_SEM_PALPITES = 0.3
+    try:
+        g1, g2 = cria_gerador(32, 5), cria_gerador(32, 5)
+        inicio = perf_counter()
+        m1 = coloca_minas(cria_campo_compacto('I', 9), PRIMEIRA, g1, 50, 'sem-palpites')
+        assert perf_counter() - inicio < 5
+        m2 = coloca_minas(cria_campo_compacto('I', 9), PRIMEIRA, g2, 50)
+        assert obtem_coordenadas(m1, 'minadas') == obtem_coordenadas(m2, 'minadas') and geradores_iguais(g1, g2)
+    finally:
+        projeto._TEMPO_SEM_PALPITES = anterior
+        termina_processos_sem_palpites()
+    try: coloca_minas(cria_campo_compacto('I', 9), PRIMEIRA, cria_gerador(32, 5), 73, 'sem-palpites')
+    except ValueError: pass
+    else: assert False
+
+if __name__ == '__main__':
+    test_deterministico()
+    test_densidade_sem_solucao()
+    test_recurso_ao_modo_gerador()
+    print('ok')
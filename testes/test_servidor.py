@@ -0,0 +1,79 @@
+"""
+Protocolo do servidor (processa_comando, sem rede) e um teste de carga
+pequeno sobre um socket Unix
+"""
+import asyncio
+import os
+import tempfile
+
+from bruto import *
+from servidor import carga, cria_sessao, inicia_servidor, processa_comando
+
+def comando(sessao, linha):
+    respostas, continua = processa_comando(sessao, linha)
+    assert continua
+    return respostas
+
+def test_novo_e_erros_de_argumentos():
+    sessao = cria_sessao()
+    assert comando(sessao, '') == ['ERRO comando vazio']
+    assert comando(sessao, 'L A01') == ['ERRO sem jogo']
+    assert comando(sessao, 'CAMPO') == ['ERRO sem jogo']
+    for linha in ('NOVO', 'NOVO I', 'NOVO I 9 10 32', 'NOVO I 9 x 32 1', 'NOVO I 9 0 32 1', 'NOVO I 9 73 32 1',
+                  'NOVO 1 9 10 32 1', 'NOVO I 9 10 16 1', 'NOVO I 9 10 32 1 2'):
+        assert comando(sessao, linha) == ['ERRO argumentos invalidos'], linha
+    assert comando(sessao, 'novo I 9 10 32 1') == ['OK I 9 10']
+    for linha in ('X A01', 'L', 'L A01 B01'): assert comando(sessao, linha) == ['ERRO comando desconhecido'], linha
+    for linha in ('L J01', 'L A10', 'L A00', 'L A1', 'L 101', 'L A+1'): assert comando(sessao, linha) == ['ERRO coordenada invalida'], linha
+    assert processa_comando(sessao, 'SAIR') == (['ADEUS'], False)
+
+def test_jogo_igual_a_simula_jogo():
+    # As respostas a L e M têm de reproduzir o Campo de um jogo simulado com as mesmas jogadas
+    for s in range(1, 6):
+        jogador, jogadas = jogador_resolvedor(), []
+        def regista(m):
+            jogada = jogador(m)
+            if jogada is not None: jogadas.append(jogada)
+            return jogada
+        stats = simula_jogo('I', 9, 10, 32, s, regista)
+        sessao = cria_sessao()
+        assert comando(sessao, 'NOVO I 9 10 32 {}'.format(s)) == ['OK I 9 10']
+        desenho = {coordenada_para_str(c): '#' for c in obtem_coordenadas(cria_campo_compacto('I', 9), 'tapadas')}
+        for i, (acao, c) in enumerate(jogadas):
+            estado, *alteracoes = comando(sessao, '{} {}'.format(acao, coordenada_para_str(c)))[0].split()
+            desenho.update(a.split('=') for a in alteracoes)
+            assert estado == ('JOGO' if i < len(jogadas) - 1 else {True: 'VITORIA', False: 'DERROTA'}[stats['resultado']])
+        assert comando(sessao, 'L A01') == ['ERRO jogo terminado']
+        linhas = comando(sessao, 'CAMPO')
+        assert linhas[0] == 'CAMPO {}'.format(len(linhas) - 1) and '\n'.join(linhas[1:]) == campo_para_str(stats['campo'])
+        m = stats['campo']
+        for c in obtem_coordenadas(m, 'limpas'):
+            esperado = 'X' if eh_parcela_minada(obtem_parcela(m, c)) else str(obtem_numero_minas_vizinhas(m, c))
+            assert desenho[coordenada_para_str(c)] == esperado, (s, c)
+
+def test_marcar():
+    sessao = cria_sessao()
+    comando(sessao, 'NOVO I 9 10 32 1')
+    assert comando(sessao, 'M A01') == ['JOGO A01=@']
+    assert comando(sessao, 'M A01') == ['JOGO A01=#']
+    assert comando(sessao, 'M A01') == ['JOGO A01=@']
+
+def test_carga():
+    async def corre(endereco, clientes):
+        servidor, estado = await inicia_servidor(endereco)
+        async with servidor: return await carga(endereco, clientes, config=('I', 9, 10, 32), jogos=2), estado
+    with tempfile.TemporaryDirectory() as pasta:
+        endereco = os.path.join(pasta, 'minas.sock')
+        resumo, estado = asyncio.run(corre(endereco, 20))
+        assert resumo['falhas'] == 0 and resumo['jogos'] == 40 and resumo['comandos'] > 40 and resumo['mediana'] is not None
+        assert estado['sessoes'] == 0
+        # Sem servidor, todos os clientes falham, e o resumo não tem tempos
+        resumo = asyncio.run(carga(os.path.join(pasta, 'nenhum.sock'), 3))
+        assert resumo['falhas'] == 3 and resumo['comandos'] == 0 and resumo['mediana'] is None and resumo['p99'] is None
+
+if __name__ == '__main__':
+    test_novo_e_erros_de_argumentos()
+    test_jogo_igual_a_simula_jogo()
+    test_marcar()
+    test_carga()
+    print('ok')
@@ -0,0 +1,30 @@
+"""
+analisa_semente e varre_sementes: o jogador continua a partir da primeira
+jogada da configuração, e os resultados não dependem do número de processos
+"""
+from bruto import *
+
+CONFIG = ('P', 16, 40, 32, cria_coordenada('A', 1))
+
+def test_jogador_continua_apos_primeira_jogada():
+    for s in range(1, 41):
+        m = simula_jogo(*CONFIG[:4], s, iter([('L', CONFIG[4])]))['campo']
+        seguras = resolve_campo(cria_resolvedor(m))[0]
+        segunda = jogador_resolvedor()(m)
+        if seguras: assert segunda == ('L', seguras[0]), s
+        assert not eh_parcela_limpa(obtem_parcela(m, segunda[1])), s
+
+def test_varre_sementes_deterministico():
+    um = [r for b in varre_sementes([CONFIG], range(1, 61), jogador_resolvedor, processos=1, bloco=16) for r in b]
+    dois = [r for b in varre_sementes([CONFIG], range(1, 61), jogador_resolvedor, processos=2, bloco=16) for r in b]
+    assert um == dois and [r['semente'] for r in um] == list(range(1, 61))
+    for r in um:
+        assert 0 <= r['densidade_abertura'] <= 1
+        assert (r['densidade_derrota'] is None) == (r['resultado'] is not False)
+    a = agrega_resultados(um)[CONFIG]
+    assert a['jogos'] == 60 and a['vitorias'] + a['derrotas'] == 60
+
+if __name__ == '__main__':
+    test_jogador_continua_apos_primeira_jogada()
+    test_varre_sementes_deterministico()
+    print('ok')